@@ -2,81 +2,56 @@ import pandas as pd
 import json
 import os
 import sys
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill, Alignment
-from openpyxl.utils import get_column_letter
+import argparse
+from excel_styles import write_styled_excel
+from record_io import open_text, strip_compression, COMPRESSION_EXTENSIONS
+from spill import exceeds_memory_limit, write_excel_streaming
+from schema_profiles import resolve_json_schema, schema_label
+from checkpoint import Checkpoint, file_fingerprint
+from progress import ProgressReporter
 import glob
 
-def convert_json_to_excel(json_file, output_folder):
+def convert_json_to_excel(json_file, output_folder, profile=None, memory_limit=None, schema=None):
     """
-    Convert a single JSON file to Excel format
+    Convert a single JSON file to Excel format using a styling profile
+    (see excel_styles.STYLE_PROFILES). Files whose estimated working set is
+    above memory_limit (e.g. '2G') are streamed row by row. schema ('auto' or
+    a template name) reuses the styling cached for the input's header; a
+    template name also fails the file when its header changed (see schema_profiles).
     """
     try:
         # Read JSON file with UTF-8 encoding to handle special characters
-        with open(json_file, 'r', encoding='utf-8') as file:
+        with open_text(json_file) as file:
             data = json.load(file)
         
+        if schema:
+            # Known template: records key and styling come from its cached profile
+            records, schema_profile, cached = resolve_json_schema(data, schema, profile)
+            print(schema_label(schema_profile, cached))
+            profile = profile or schema_profile['styling']
         # Check if data is a list or dict
-        if isinstance(data, list):
+        elif isinstance(data, list):
             # If it's a list, use it directly
-            df = pd.DataFrame(data)
+            records = data
         elif isinstance(data, dict):
             # If it's a dict, get the first key's value
             query_key = list(data.keys())[0]
-            df = pd.DataFrame(data[query_key])
+            records = data[query_key]
         else:
             raise ValueError("JSON data must be either a list or a dictionary")
         
         # Create output filename
         base_name = os.path.basename(json_file)
-        excel_name = base_name.replace('.json', '.xlsx')
+        excel_name = strip_compression(base_name).replace('.json', '.xlsx')
         excel_file = os.path.join(output_folder, excel_name)
         
         # Export to Excel
-        df.to_excel(excel_file, index=False, sheet_name='Data')
-        
-        # Load workbook for formatting
-        wb = load_workbook(excel_file)
-        ws = wb['Data']
-        
-        # Define header color (10b4b1) - convert to RGB format
-        header_fill = PatternFill(start_color='FF10B4B1',
-                                end_color='FF10B4B1',
-                                fill_type='solid')
-        
-        # Format headers
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center', 
-                                     vertical='center',
-                                     wrap_text=True)
-        
-        # Freeze pane below header
-        ws.freeze_panes = 'A2'
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            # Set column width with some padding
-            adjusted_width = min(max_length + 2, 50)  # Max width of 50
-            ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Set alignment for all cells in column
-            for cell in column:
-                cell.alignment = Alignment(vertical='center',
-                                        wrap_text=True)
-        
-        # Save the formatted workbook
-        wb.save(excel_file)
+        if exceeds_memory_limit(json_file, memory_limit):
+            # Too big for a DataFrame + workbook model: stream rows to a write-only workbook
+            write_excel_streaming(records, excel_file, 'Data', profile)
+        else:
+            # Write and style in one pass (shared named styles, O(columns))
+            write_styled_excel(pd.DataFrame(records), excel_file, 'Data', profile)
         print(f"✓ Converted: {base_name} -> {excel_name}")
         return True
         
@@ -84,9 +59,12 @@ def convert_json_to_excel(json_file, output_folder):
         print(f"✗ Error converting {json_file}: {e}")
         return False
 
-def batch_convert_json_to_excel():
+def batch_convert_json_to_excel(profile=None, checkpoint=False, memory_limit=None, quiet=False, schema=None):
     """
-    Convert all JSON files in jsonuser folder to Excel files in data-excel folder
+    Convert all JSON files in jsonuser folder to Excel files in data-excel folder.
+    With checkpoint=True, converted files are recorded so a rerun after a crash
+    only converts the remaining (or changed) files. A live files/s and ETA
+    line goes to stderr unless quiet is set.
     """
     # Define paths
     json_folder = 'jsonuser'
@@ -102,9 +80,10 @@ def batch_convert_json_to_excel():
         os.makedirs(output_folder)
         print(f"Created output folder: {output_folder}")
     
-    # Find all JSON files in jsonuser folder
-    json_pattern = os.path.join(json_folder, '*.json')
-    json_files = glob.glob(json_pattern)
+    # Find all JSON files in jsonuser folder (plain or compressed)
+    json_files = []
+    for ext in ('',) + COMPRESSION_EXTENSIONS:
+        json_files.extend(glob.glob(os.path.join(json_folder, '*.json' + ext)))
     
     if not json_files:
         print(f"No JSON files found in '{json_folder}' folder!")
@@ -113,24 +92,54 @@ def batch_convert_json_to_excel():
     print(f"Found {len(json_files)} JSON files to convert...")
     print("-" * 50)
     
+    state = None
+    if checkpoint:
+        state = Checkpoint(os.path.join(output_folder, '.batch-checkpoint'),
+                           {'source': os.path.abspath(json_folder), 'profile': profile})
+    
     # Convert each JSON file
     success_count = 0
     failed_count = 0
+    skipped_count = 0
+    progress = ProgressReporter(len(json_files), 'Converting', 'files', quiet)
     
     for json_file in json_files:
-        if convert_json_to_excel(json_file, output_folder):
+        fingerprint = file_fingerprint(json_file)
+        if state is not None and state.is_done(json_file, fingerprint):
+            skipped_count += 1
+            progress.update()
+            continue
+        progress.clear()
+        if convert_json_to_excel(json_file, output_folder, profile, memory_limit, schema):
             success_count += 1
+            if state is not None:
+                state.mark_done(json_file, fingerprint)
         else:
             failed_count += 1
+        progress.update()
+    progress.finish()
     
     # Print summary
     print("-" * 50)
     print(f"Conversion Summary:")
     print(f"✓ Successfully converted: {success_count} files")
     print(f"✗ Failed to convert: {failed_count} files")
+    if skipped_count:
+        print(f"⏭️  Already converted (checkpoint): {skipped_count} files")
     print(f"📁 Excel files saved in: {output_folder}")
 
+    # Keep the checkpoint while files still need converting
+    if state is not None and failed_count == 0:
+        state.clear()
+
 if __name__ == "__main__":
     print("Batch JSON to Excel Converter")
     print("=" * 50)
-    batch_convert_json_to_excel()
+    parser = argparse.ArgumentParser(description="Convert all JSON files in jsonuser to Excel files in data-excel")
+    parser.add_argument('profile', nargs='?', help="styling profile (default, compact, wide, plain)")
+    parser.add_argument('--checkpoint', action='store_true', help="record converted files so an interrupted run can resume")
+    parser.add_argument('--memory-limit', help="e.g. 2G; stream files whose estimated working set is larger")
+    parser.add_argument('--quiet', action='store_true', help="no live progress output (for cron jobs)")
+    parser.add_argument('--schema', help="'auto' or a template name: cache the header profile and reuse its styling; a template name also fails on a changed header")
+    args = parser.parse_args()
+    batch_convert_json_to_excel(args.profile, args.checkpoint, args.memory_limit, args.quiet, args.schema)
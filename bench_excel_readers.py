@@ -0,0 +1,90 @@
+import io
+import os
+import sys
+import time
+import argparse
+import tempfile
+from contextlib import redirect_stdout
+from perf_guard import generate_outlets, write_colored_workbook
+from exceltojson import EXCEL_ENGINES, available_engines, read_excel_frame, excel_to_json
+
+# Sheet sizes we get from the field teams
+DEFAULT_ROWS = [5_000, 50_000, 200_000]
+
+
+def best_time(func, repeat):
+    """Fastest of repeat runs in seconds"""
+    best = None
+    for _ in range(repeat):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_excel_readers(row_counts=None, engines=None, repeat=3):
+    """Time value reading and the full excel_to_json per engine and sheet size.
+
+    Returns a list of result rows (rows, engine, stage, seconds, rows/s).
+    """
+    row_counts = row_counts or DEFAULT_ROWS
+    engines = engines or available_engines()
+    missing = [e for e in EXCEL_ENGINES if e not in available_engines()]
+    if missing:
+        print(f"Not installed, skipped: {', '.join(missing)}")
+
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench-excel-') as workdir:
+        for rows in row_counts:
+            excel_file = os.path.join(workdir, f"outlets-{rows}.xlsx")
+            json_file = os.path.join(workdir, 'out.json')
+            print(f"Generating {rows} rows...")
+            write_colored_workbook(generate_outlets(rows), excel_file)
+            for engine in engines:
+                stages = {
+                    'read values': lambda: read_excel_frame(excel_file, engine),
+                    'excel_to_json': lambda: excel_to_json(excel_file, json_file, quiet=True, engine=engine),
+                }
+                for stage, func in stages.items():
+                    seconds = best_time(func, repeat)
+                    results.append((rows, engine, stage, seconds, rows / seconds))
+    return results
+
+
+def print_results(results, file=None):
+    print(f"{'rows':>10}  {'engine':<10}{'stage':<16}{'seconds':>10}{'rows/s':>12}", file=file)
+    for rows, engine, stage, seconds, rate in results:
+        print(f"{rows:>10}  {engine:<10}{stage:<16}{seconds:>10.2f}{rate:>12.0f}", file=file)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Excel reader engines for excel_to_json")
+    parser.add_argument('--rows', help=f"comma separated sheet sizes (default: {','.join(map(str, DEFAULT_ROWS))})")
+    parser.add_argument('--engines', help=f"comma separated engines (default: installed ones of {', '.join(EXCEL_ENGINES)})")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per measurement, best one counts (default: 3)")
+    parser.add_argument('--output', help="also write the table to this file, e.g. bench_output.txt")
+    args = parser.parse_args()
+
+    row_counts = [int(r) for r in args.rows.split(',')] if args.rows else None
+    engines = [e.strip() for e in args.engines.split(',')] if args.engines else None
+    unknown = [e for e in engines or [] if e not in EXCEL_ENGINES]
+    if unknown:
+        parser.error(f"unknown engine(s): {', '.join(unknown)}")
+
+    try:
+        results = bench_excel_readers(row_counts, engines, args.repeat)
+    except ImportError as e:
+        print(f"❌ Error: {str(e)}")
+        sys.exit(1)
+    print("-" * 60)
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            print_results(results, f)
+        print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
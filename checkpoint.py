@@ -0,0 +1,88 @@
+import json
+import os
+import shutil
+import tempfile
+
+
+def atomic_write_json(path, data):
+    """Write JSON to path via a temp file + rename, so a crash never leaves half a file.
+
+    The temp file is unique per call, so concurrent writers of the same path
+    (e.g. workers profiling the same header) never clobber each other's file.
+    """
+    path = os.fspath(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                    dir=os.path.dirname(path) or '.')
+    try:
+        with open(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def file_fingerprint(path):
+    """Cheap identity of an input file: size and modification time"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class Checkpoint:
+    """Records completed work items (files or record chunks) in a small state file.
+
+    The state is only reused when its signature (inputs and options that
+    affect the result) matches; otherwise the run starts from scratch.
+    """
+    def __init__(self, state_dir, signature):
+        self.state_dir = state_dir
+        self.state_file = os.path.join(state_dir, 'state.json')
+        self.signature = signature
+        self.completed = {}
+
+        if os.path.exists(self.state_file):
+            try:
+                with open(self.state_file, encoding='utf-8') as f:
+                    state = json.load(f)
+                if state.get('signature') == signature:
+                    self.completed = state.get('completed', {})
+            except (OSError, ValueError):
+                pass
+        if not self.completed and os.path.isdir(state_dir):
+            # Stale or unreadable state: drop any leftover chunk files
+            shutil.rmtree(state_dir)
+        os.makedirs(state_dir, exist_ok=True)
+
+    def __len__(self):
+        return len(self.completed)
+
+    def is_done(self, item, info=None):
+        """True if item was completed (with the same info, when given)"""
+        if item not in self.completed:
+            return False
+        return info is None or self.completed[item] == info
+
+    def mark_done(self, item, info=True):
+        """Commit an item as completed"""
+        self.completed[item] = info
+        atomic_write_json(self.state_file, {'signature': self.signature, 'completed': self.completed})
+
+    def save_chunk(self, item, payload):
+        """Store a completed chunk's data, then commit the item"""
+        atomic_write_json(self.chunk_path(item), payload)
+        self.mark_done(item)
+
+    def load_chunk(self, item):
+        with open(self.chunk_path(item), encoding='utf-8') as f:
+            return json.load(f)
+
+    def chunk_path(self, item):
+        return os.path.join(self.state_dir, f"chunk-{item}.json")
+
+    def clear(self):
+        """Remove the state once the whole run has finished"""
+        shutil.rmtree(self.state_dir, ignore_errors=True)
+        self.completed = {}
@@ -0,0 +1,73 @@
+from functools import lru_cache, wraps
+
+# Default number of distinct input values remembered per cleaner
+DEFAULT_CACHE_SIZE = 4096
+
+_cleaners = {}
+
+
+def memoized_cleaner(func):
+    """Wrap a single-value cleaner in a bounded LRU cache.
+
+    Unhashable values (lists, dicts) bypass the cache. typed=True keeps
+    e.g. 1 and 1.0 apart, since the cleaners stringify their input.
+    """
+    _cleaners[func.__name__] = {
+        'func': func,
+        'cached': lru_cache(maxsize=DEFAULT_CACHE_SIZE, typed=True)(func),
+    }
+    entry = _cleaners[func.__name__]
+
+    @wraps(func)
+    def wrapper(value):
+        try:
+            hash(value)
+        except TypeError:
+            return func(value)
+        return entry['cached'](value)
+
+    wrapper.uncached = func
+    return wrapper
+
+
+def configure_cleaner_cache(maxsize=DEFAULT_CACHE_SIZE):
+    """Resize (and reset) every cleaner cache. maxsize=0 disables caching"""
+    for entry in _cleaners.values():
+        entry['cached'] = lru_cache(maxsize=maxsize, typed=True)(entry['func'])
+
+
+def cleaner_cache_stats():
+    """Return {cleaner name: (hits, misses, currsize, maxsize)} for used cleaners"""
+    stats = {}
+    for name, entry in _cleaners.items():
+        info = entry['cached'].cache_info()
+        if info.hits or info.misses:
+            stats[name] = (info.hits, info.misses, info.currsize, info.maxsize)
+    return stats
+
+
+def print_cleaner_cache_stats(stats=None):
+    """Print the hit rate of each used cleaner cache"""
+    if stats is None:
+        stats = cleaner_cache_stats()
+    for name, (hits, misses, currsize, maxsize) in stats.items():
+        total = hits + misses
+        rate = hits / total * 100 if total else 0.0
+        print(f"Cache {name}: {hits}/{total} hits ({rate:.1f}%), {currsize}/{maxsize} entries")
+
+
+def cache_stats_delta(before, after):
+    """Hits and misses between two cleaner_cache_stats() snapshots"""
+    delta = {}
+    for name, (hits, misses, currsize, maxsize) in after.items():
+        old_hits, old_misses = before.get(name, (0, 0, 0, 0))[:2]
+        delta[name] = (hits - old_hits, misses - old_misses, currsize, maxsize)
+    return delta
+
+
+def merge_cache_stats(total, stats):
+    """Add stats from another process into total (counts summed, sizes maxed)"""
+    for name, (hits, misses, currsize, maxsize) in stats.items():
+        old = total.get(name, (0, 0, 0, maxsize))
+        total[name] = (old[0] + hits, old[1] + misses, max(old[2], currsize), maxsize)
+    return total
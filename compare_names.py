@@ -1,11 +1,18 @@
 import json
+import argparse
+from record_io import open_text
+
+parser = argparse.ArgumentParser(description="Compare the names of two JSON exports")
+parser.add_argument('file1', nargs='?', default='file1.json', help="first JSON file, may be compressed (default: file1.json)")
+parser.add_argument('file2', nargs='?', default='file2.json', help="second JSON file, may be compressed (default: file2.json)")
+args = parser.parse_args()
 
 # Read file1.json
-with open('file1.json', 'r', encoding='utf-8') as f:
+with open_text(args.file1) as f:
     file1_data = json.load(f)
 
 # Read file2.json
-with open('file2.json', 'r', encoding='utf-8') as f:
+with open_text(args.file2) as f:
     file2_data = json.load(f)
 
 # Extract names from both files
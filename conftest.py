@@ -0,0 +1,34 @@
+import os
+import pytest
+from perf_guard import BASELINE_FILE, DEFAULT_ROWS, DEFAULT_TOLERANCE
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('perf', 'converter performance guard (test_perf.py)')
+    group.addoption('--perf-rows', type=int, default=DEFAULT_ROWS,
+                    help=f"generated rows per dataset (default: {DEFAULT_ROWS})")
+    group.addoption('--perf-repeat', type=int, default=3,
+                    help="timed runs per benchmark, best one counts (default: 3)")
+    group.addoption('--perf-tolerance', type=float, default=DEFAULT_TOLERANCE,
+                    help=f"allowed throughput regression in percent (default: {DEFAULT_TOLERANCE:.0f})")
+    group.addoption('--perf-baseline', default=BASELINE_FILE,
+                    help=f"per-machine baseline file (default: {BASELINE_FILE})")
+    group.addoption('--perf-update', action='store_true',
+                    help="record the measured numbers as the new baseline instead of checking")
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', "perf: converter throughput/memory checks against the baseline "
+                                       "(deselect with -m 'not perf')")
+    # Resolve the baseline before tests change the working directory
+    config.option.perf_baseline = os.path.abspath(config.option.perf_baseline)
+
+
+def pytest_collection_modifyitems(config, items):
+    # The perf layer takes minutes: it only runs when selected with -m perf
+    if 'perf' in (config.option.markexpr or ''):
+        return
+    skip = pytest.mark.skip(reason="performance check, run with: pytest -m perf")
+    for item in items:
+        if 'perf' in item.keywords:
+            item.add_marker(skip)
@@ -2,8 +2,22 @@ import json
 import pandas as pd
 import re
 import os
-import sys
+import argparse
+import hashlib
+import sqlite3
+import tempfile
+import math
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from checkpoint import Checkpoint, file_fingerprint
+from record_io import open_text, strip_compression
+from spill import RecordSpool, exceeds_memory_limit, write_excel_streaming
+from cleaner_cache import (memoized_cleaner, configure_cleaner_cache, print_cleaner_cache_stats,
+                           cleaner_cache_stats, cache_stats_delta, merge_cache_stats, DEFAULT_CACHE_SIZE)
+from progress import ProgressReporter
+from schema_profiles import resolve_schema, json_header, schema_label
 
+@memoized_cleaner
 def clean_latitude(lat):
     """Clean and validate latitude values. Valid range: -90 to 90"""
     if lat is None or lat == '' or str(lat).strip() == '':
@@ -32,6 +46,7 @@ def clean_latitude(lat):
     except (ValueError, TypeError):
         return '0.0'
 
+@memoized_cleaner
 def clean_ptkp(ptkp):
     """Clean and format PTKP values"""
     if ptkp is None or ptkp == '' or str(ptkp).strip() == '':
@@ -53,6 +68,7 @@ def clean_ptkp(ptkp):
     except Exception:
         return None
 
+@memoized_cleaner
 def clean_longitude(lon):
     """Clean and validate longitude values. Valid range: -180 to 180"""
     if lon is None or lon == '' or str(lon).strip() == '':
@@ -82,17 +98,368 @@ def clean_longitude(lon):
     except (ValueError, TypeError):
         return '0.0'
 
-def process_data(input_filename=None):
-    """Process outlet data with improved error handling and validation"""
+@memoized_cleaner
+def clean_email(email):
+    """Clean email values. Returns (email, fixed) where fixed means @gmail.com was added"""
+    if email is None or email == '' or str(email).strip() == '':
+        return None, False
+
+    email = str(email).strip().lower()
+    # Basic email validation
+    if '@' in email and '.' in email:
+        return email, False
+    # Add @gmail.com if email format is invalid
+    return email + '@gmail.com', True
+
+def clean_record(record, record_number):
+    """Clean a single outlet record in place and return its warning messages"""
+    warnings = []
+
+    # Clean latitude and longitude
+    if 'latitude' in record:
+        original_lat = record['latitude']
+        record['latitude'] = clean_latitude(record['latitude'])
+        if original_lat and str(original_lat).strip() and record['latitude'] == '0.0':
+            warnings.append(f"Warning: Invalid latitude '{original_lat}' in record {record_number}, set to 0.0")
+
+    if 'longitude' in record:
+        original_lon = record['longitude']
+        record['longitude'] = clean_longitude(record['longitude'])
+        if original_lon and str(original_lon).strip() and record['longitude'] == '0.0':
+            warnings.append(f"Warning: Invalid longitude '{original_lon}' in record {record_number}, set to 0.0")
+
+    # Clean string fields
+    for field in ('name', 'phone', 'client', 'outlet', 'rekening', 'kk'):
+        if field in record and record[field]:
+            record[field] = str(record[field]).strip()
+
+    if 'ptkp' in record:
+        record['ptkp'] = clean_ptkp(record['ptkp'])
+
+    if 'email' in record:
+        record['email'], fixed = clean_email(record['email'])
+        if fixed:
+            warnings.append(f"Warning: Invalid email format, added @gmail.com to '{record['email'][:-len('@gmail.com')]}' in record {record_number}")
+
+    return warnings
+
+def clean_records(records, offset=0, progress=None):
+    """Clean a list of records in place; offset is the position of records[0] in the file.
+
+    Returns the warning messages in record order. progress is an optional
+    ProgressReporter updated once per record.
+    """
+    warnings = []
+    for i, record in enumerate(records, start=offset):
+        if progress is not None:
+            progress.update()
+        if not isinstance(record, dict):
+            warnings.append(f"Warning: Record {i+1} is not a valid object, skipping...")
+            continue
+        warnings.extend(clean_record(record, i + 1))
+    return warnings
+
+# Records per committed chunk when checkpointing
+CHECKPOINT_CHUNK_SIZE = 50_000
+
+# Smaller chunks in parallel mode keep every worker busy until the end
+PARALLEL_CHUNK_SIZE = 10_000
+
+def _init_clean_worker(cache_size):
+    configure_cleaner_cache(cache_size)
+
+def changed_fields(original, cleaned):
+    """Fields of cleaned whose value (or type) differs from original"""
+    return {key: value for key, value in cleaned.items()
+            if type(value) is not type(original.get(key)) or value != original.get(key)}
+
+def _clean_chunk(task):
+    """Worker: clean one chunk of records.
+
+    Returns (changes, warnings, cache stats of this chunk), where changes
+    lists (position in chunk, changed fields) for the records that changed.
+    """
+    records, start = task
+    before = cleaner_cache_stats()
+    originals = [dict(r) if isinstance(r, dict) else r for r in records]
+    warnings = clean_records(records, start)
+    changes = []
+    for i, (original, record) in enumerate(zip(originals, records)):
+        if isinstance(record, dict):
+            fields = changed_fields(original, record)
+            if fields:
+                changes.append((i, fields))
+    return changes, warnings, cache_stats_delta(before, cleaner_cache_stats())
+
+def iter_cleaned_chunks(data, starts, chunk_size, workers, cache_size, stats):
+    """Clean data[start:start + chunk_size] for each start across a process pool.
+
+    Each chunk is sent to a worker and only its changed fields come back.
+    Yields (start, changes, warnings) in the order of starts, whatever order
+    the workers finish in. At most two chunks per worker are in flight, so
+    memory grows by those chunks only. Cache stats of the workers are merged
+    into stats.
+    """
+    pending = deque()
+    starts = iter(starts)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_clean_worker,
+                             initargs=(cache_size,)) as executor:
+        while True:
+            while len(pending) < workers * 2:
+                start = next(starts, None)
+                if start is None:
+                    break
+                pending.append((start, executor.submit(_clean_chunk, (data[start:start + chunk_size], start))))
+            if not pending:
+                break
+            start, future = pending.popleft()
+            changes, warnings, chunk_stats = future.result()
+            merge_cache_stats(stats, chunk_stats)
+            yield start, changes, warnings
+
+# Number of distinct dedupe keys kept in memory before the index spills to disk
+DEDUPE_MEMORY_KEYS = 1_000_000
+
+class _HashIndex:
+    """Maps row-key digests to record positions, spilling to SQLite when large"""
+    def __init__(self, max_keys=DEDUPE_MEMORY_KEYS):
+        self.max_keys = max_keys
+        self._memory = {}
+        self._db = None
+        self._db_path = None
+
+    def get(self, digest):
+        if self._db is None:
+            return self._memory.get(digest)
+        row = self._db.execute('SELECT pos FROM keys WHERE digest = ?', (digest,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, digest, pos):
+        if self._db is None and len(self._memory) >= self.max_keys and digest not in self._memory:
+            self._spill()
+        if self._db is None:
+            self._memory[digest] = pos
+        else:
+            self._db.execute('INSERT OR REPLACE INTO keys VALUES (?, ?)', (digest, pos))
+
+    def _spill(self):
+        fd, self._db_path = tempfile.mkstemp(prefix='dedupe-', suffix='.sqlite')
+        os.close(fd)
+        self._db = sqlite3.connect(self._db_path)
+        self._db.execute('PRAGMA journal_mode = OFF')
+        self._db.execute('PRAGMA synchronous = OFF')
+        self._db.execute('CREATE TABLE keys (digest BLOB PRIMARY KEY, pos INTEGER) WITHOUT ROWID')
+        self._db.executemany('INSERT INTO keys VALUES (?, ?)', self._memory.items())
+        self._memory.clear()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            os.remove(self._db_path)
+            self._db = None
+
+def normalize_key_value(value):
+    """Normalize a key value: trim, collapse inner whitespace and ignore case"""
+    if value is None:
+        return ''
+    return ' '.join(str(value).split()).casefold()
+
+def record_key_digest(record, key_columns):
+    """Hash the normalized key columns of a record, None if all keys are empty"""
+    parts = [normalize_key_value(record.get(column)) for column in key_columns]
+    if not any(parts):
+        return None
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=16).digest()
+
+def iter_deduplicated(records, key_columns, keep='first', stats=None, max_memory_keys=DEDUPE_MEMORY_KEYS):
+    """Yield records without duplicates on the normalized key columns.
+
+    keep='first' is a single streaming pass. keep='last' needs a re-iterable
+    input (e.g. a list), since it first finds the last position of each key.
+    Records without any key value and non-dict entries are always kept.
+    """
+    if keep not in ('first', 'last'):
+        raise ValueError("keep must be 'first' or 'last'")
+    if stats is None:
+        stats = {}
+    stats['dropped'] = 0
+    index = _HashIndex(max_memory_keys)
+    try:
+        if keep == 'last':
+            for pos, record in enumerate(records):
+                if isinstance(record, dict):
+                    digest = record_key_digest(record, key_columns)
+                    if digest is not None:
+                        index.set(digest, pos)
+
+        for pos, record in enumerate(records):
+            if not isinstance(record, dict):
+                yield record
+                continue
+            digest = record_key_digest(record, key_columns)
+            if digest is None:
+                yield record
+            elif keep == 'first':
+                if index.get(digest) is None:
+                    index.set(digest, pos)
+                    yield record
+                else:
+                    stats['dropped'] += 1
+            elif index.get(digest) == pos:
+                yield record
+            else:
+                stats['dropped'] += 1
+    finally:
+        index.close()
+
+def dedupe_records(records, key_columns, keep='first', max_memory_keys=DEDUPE_MEMORY_KEYS):
+    """Return (deduplicated records, number of dropped records)"""
+    stats = {}
+    unique = list(iter_deduplicated(records, key_columns, keep, stats, max_memory_keys))
+    return unique, stats['dropped']
+
+EARTH_RADIUS_M = 6_371_000
+
+# Fields copied into the coordinate clusters report when present
+CLUSTER_REPORT_FIELDS = ['name', 'outlet', 'client', 'phone']
+
+def haversine_m(lat1, lon1, lat2, lon2):
+    """Great-circle distance in metres between two coordinates"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+def find_coordinate_clusters(records, radius_m=50.0):
+    """Group records whose coordinates lie within radius_m metres of each other.
+
+    Coordinates are bucketed into a grid of cells at least radius_m wide, so
+    each location is only compared with locations in its 3x3 neighbourhood.
+    Cell sizes are in degrees: radius_m of latitude, and the longitude span
+    radius_m can cover at the dataset's largest |latitude|, so two points
+    within the radius are never more than one cell apart.
+    Returns (clusters, missing): clusters is a list of record position lists
+    (only groups with more than one record), missing holds the positions of
+    records with either coordinate at 0.0 (the value clean_latitude and
+    clean_longitude give invalid input), which are never clustered.
+    """
+    if radius_m <= 0:
+        raise ValueError("radius_m must be positive")
+
+    # Collapse identical coordinates first so a big pile-up costs O(1)
+    locations = {}
+    missing = []
+    for pos, record in enumerate(records):
+        if not isinstance(record, dict) or 'latitude' not in record or 'longitude' not in record:
+            continue
+        try:
+            lat = float(record['latitude'])
+            lon = float(record['longitude'])
+        except (TypeError, ValueError):
+            continue
+        if lat == 0.0 or lon == 0.0:
+            missing.append(pos)
+            continue
+        locations.setdefault((lat, lon), []).append(pos)
+
+    coords = list(locations)
+    parent = list(range(len(coords)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # haversine_m >= R * dlat and >= 2R * asin(cos(max |lat|) * sin(dlon / 2)),
+    # which bounds how far apart two points within radius_m can be per axis
+    angle = radius_m / EARTH_RADIUS_M
+    max_cos = math.cos(math.radians(max((abs(lat) for lat, _ in coords), default=0.0)))
+    cell_lat = math.degrees(angle) * (1 + 1e-9)
+    lon_sine = math.sin(angle / 2) / max_cos if max_cos > 0 else 1.0
+    cell_lon = math.degrees(2 * math.asin(min(1.0, lon_sine))) * (1 + 1e-9)
+
+    grid = {}
+    for idx, (lat, lon) in enumerate(coords):
+        cell = (math.floor(lat / cell_lat), math.floor(lon / cell_lon))
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                for other in grid.get((cell[0] + dy, cell[1] + dx), ()):
+                    if haversine_m(lat, lon, *coords[other]) <= radius_m:
+                        root_a, root_b = find(idx), find(other)
+                        if root_a != root_b:
+                            parent[root_b] = root_a
+        grid.setdefault(cell, []).append(idx)
+
+    groups = {}
+    for idx, coord in enumerate(coords):
+        groups.setdefault(find(idx), []).extend(locations[coord])
+    clusters = [sorted(positions) for positions in groups.values() if len(positions) > 1]
+    clusters.sort(key=lambda positions: positions[0])
+    return clusters, missing
+
+def write_cluster_report(records, clusters, missing, report_file):
+    """Write the coordinate clusters as one row per flagged record"""
+    rows = []
+
+    def add_rows(cluster_id, positions):
+        for pos in positions:
+            record = records[pos]
+            row = {
+                'cluster': cluster_id,
+                'cluster_size': len(positions),
+                'row': pos + 2,  # Excel row in the cleaned output
+                'latitude': record.get('latitude'),
+                'longitude': record.get('longitude'),
+            }
+            for field in CLUSTER_REPORT_FIELDS:
+                if field in record:
+                    row[field] = record[field]
+            rows.append(row)
+
+    for number, positions in enumerate(clusters, start=1):
+        add_rows(f"C{number}", positions)
+    if missing:
+        add_rows('NO-COORD', missing)
+
+    pd.DataFrame(rows, columns=['cluster', 'cluster_size', 'row', 'latitude', 'longitude'] +
+                 [f for f in CLUSTER_REPORT_FIELDS if any(f in r for r in rows)]).to_excel(report_file, index=False)
+
+def process_data(input_filename=None, dedupe_keys=None, dedupe_keep='first', cache_size=None,
+                 cluster_radius=None, checkpoint=False, chunk_size=None,
+                 memory_limit=None, quiet=False, workers=1, schema=None):
+    """Process outlet data with improved error handling and validation.
+
+    dedupe_keys: optional list of columns (e.g. ['name', 'phone', 'rekening'])
+    used to drop duplicate outlets, keeping the first or last occurrence.
+    cache_size: number of distinct values memoized per cleaner (0 disables).
+    cluster_radius: when set, outlets within this many metres of each other
+    (and outlets without valid coordinates) are written to a '-clusters.xlsx' report.
+    checkpoint: commit cleaned chunks of chunk_size records next to the output
+    so an interrupted run resumes where it stopped with identical output.
+    memory_limit: e.g. '2G'; when the estimated working set is larger, cleaned
+    chunks spill to a temporary SQLite file and the Excel file is streamed.
+    quiet: suppress the live progress line (rows/s, elapsed, ETA) on stderr.
+    workers: clean chunks in this many processes (0 = one per CPU); each
+    chunk is copied to a worker, which sends back only changed fields, applied
+    in input order, so the output is the same as with workers=1. Memory grows
+    by two chunks per worker; the copy out limits the speedup.
+    chunk_size defaults to CHECKPOINT_CHUNK_SIZE, or PARALLEL_CHUNK_SIZE
+    when workers != 1.
+    schema: a template name; a header that differs from the template's cached
+    profile stops the run (see schema_profiles). 'auto' only caches the profile.
+    Returns True when the cleaned file was written, False on any error.
+    """
     if input_filename is None:
         input_file = 'template_isian_database_NEW_LXC.json'  # default filename
     else:
         input_file = input_filename
     
-    # Generate output filename based on input filename
-    if input_file.endswith('.json'):
+    # Generate output filename based on input filename (data.json.gz -> cleaned-data.xlsx)
+    if strip_compression(input_file).endswith('.json'):
         # Remove .json extension properly
-        base_name = input_file[:-5]
+        base_name = strip_compression(input_file)[:-5]
         # Ensure we have a valid base name
         if not base_name or base_name.strip() == '':
             base_name = 'data'
@@ -106,7 +473,7 @@ def process_data(input_filename=None):
       # Check if input file exists
     if not os.path.exists(input_file):
         print(f"Error: Input file '{input_file}' not found.")
-        return
+        return False
     
     # Validate output filename
     try:
@@ -116,96 +483,168 @@ def process_data(input_filename=None):
             os.makedirs(output_dir, exist_ok=True)
     except Exception as e:
         print(f"Error: Cannot create output directory: {e}")
-        return
+        return False
     
     try:
         # Load JSON data
-        with open(input_file, 'r', encoding='utf-8') as file:
+        with open_text(input_file) as file:
             data = json.load(file)
         
         if not isinstance(data, list):
             print("Error: JSON file should contain an array of objects.")
-            return
+            return False
         
+        if schema:
+            schema_profile, cached = resolve_schema(json_header(data), data, schema)
+            print(schema_label(schema_profile, cached))
+
         print(f"Processing {len(data)} records...")
+        cache_size = DEFAULT_CACHE_SIZE if cache_size is None else cache_size
+        configure_cleaner_cache(cache_size)
+        workers = workers or os.cpu_count()
+        if chunk_size is None:
+            chunk_size = CHECKPOINT_CHUNK_SIZE if workers == 1 else PARALLEL_CHUNK_SIZE
         
-        # Process each record
-        for i, record in enumerate(data):
-            if not isinstance(record, dict):
-                print(f"Warning: Record {i+1} is not a valid object, skipping...")
-                continue
-                
-            # Clean latitude and longitude
-            if 'latitude' in record:
-                original_lat = record['latitude']
-                record['latitude'] = clean_latitude(record['latitude'])
-                if original_lat and str(original_lat).strip() and record['latitude'] == '0.0':
-                    print(f"Warning: Invalid latitude '{original_lat}' in record {i+1}, set to 0.0")
-                    
-            if 'longitude' in record:
-                original_lon = record['longitude']
-                record['longitude'] = clean_longitude(record['longitude'])
-                if original_lon and str(original_lon).strip() and record['longitude'] == '0.0':
-                    print(f"Warning: Invalid longitude '{original_lon}' in record {i+1}, set to 0.0")
-              # Clean string fields
-            if 'name' in record and record['name']:
-                record['name'] = str(record['name']).strip()
-
-            if 'phone' in record and record['phone']:
-                record['phone'] = str(record['phone']).strip()
-
-            if 'client' in record and record['client']:
-                record['client'] = str(record['client']).strip()
-
-            if 'outlet' in record and record['outlet']:
-                record['outlet'] = str(record['outlet']).strip()
-
-            if 'rekening' in record and record['rekening']:
-                record['rekening'] = str(record['rekening']).strip()
-
-            if 'kk' in record and record['kk']:
-                record['kk'] = str(record['kk']).strip()
-            
-            if 'ptkp' in record:
-                record['ptkp'] = clean_ptkp(record['ptkp'])
-                
-            if 'email' in record:
-                if record['email'] is None or record['email'] == '' or str(record['email']).strip() == '':
-                    record['email'] = None
+        state = None
+        if checkpoint:
+            state = Checkpoint(output_file + '.checkpoint',
+                               {'input': os.path.abspath(input_file),
+                                'fingerprint': file_fingerprint(input_file),
+                                'chunk_size': chunk_size})
+            if len(state):
+                print(f"Resuming from checkpoint: {len(state)} chunks already cleaned")
+
+        spool = None
+        if exceeds_memory_limit(input_file, memory_limit):
+            print(f"Estimated working set exceeds memory limit {memory_limit}, spilling to disk")
+            spool = RecordSpool()
+
+        # Process records chunk by chunk
+        progress = ProgressReporter(len(data), 'Cleaning', 'rows', quiet)
+        starts = range(0, len(data), chunk_size)
+        worker_stats = {}
+        cleaned = None
+        if workers > 1:
+            print(f"Cleaning in {workers} processes ({chunk_size} records per chunk)")
+            todo = [start for start in starts if state is None or not state.is_done(str(start))]
+            cleaned = iter_cleaned_chunks(data, todo, chunk_size, workers, cache_size, worker_stats)
+        for start in starts:
+            chunk_id = str(start)
+            if state is not None and state.is_done(chunk_id):
+                saved = state.load_chunk(chunk_id)
+                data[start:start + chunk_size] = saved['records']
+                warnings = saved['warnings']
+                progress.update(len(saved['records']))
+            else:
+                if cleaned is not None:
+                    _, changes, warnings = next(cleaned)
+                    for i, fields in changes:
+                        data[start + i].update(fields)
+                    progress.update(len(data[start:start + chunk_size]))
                 else:
-                    email = str(record['email']).strip().lower()
-                    # Basic email validation
-                    if '@' in email and '.' in email:
-                        record['email'] = email
-                    else:
-                        # Add @gmail.com if email format is invalid
-                        record['email'] = email + '@gmail.com'
-                        print(f"Warning: Invalid email format, added @gmail.com to '{email}' in record {i+1}")
-        
-        # Convert to DataFrame and save
-        df = pd.DataFrame(data)
-        df.to_excel(output_file, index=False)
-        print(f"Data has been cleaned and saved to '{output_file}'")
-        print(f"Total records processed: {len(df)}")
-        
-        # Display some statistics
-        if 'latitude' in df.columns and 'longitude' in df.columns:
-            valid_coords = df[(df['latitude'] != '0.0') & (df['longitude'] != '0.0')]
-            print(f"Records with valid coordinates: {len(valid_coords)}")
+                    warnings = clean_records(data[start:start + chunk_size], start, progress)
+                if state is not None:
+                    state.save_chunk(chunk_id, {'records': data[start:start + chunk_size],
+                                                'warnings': warnings})
+            if warnings:
+                progress.clear()
+            for warning in warnings:
+                print(warning)
+            if spool is not None:
+                # Move the cleaned chunk to disk and release it from memory
+                spool.extend(data[start:start + chunk_size])
+                for j in range(start, min(start + chunk_size, len(data))):
+                    data[j] = None
+        progress.finish()
+        if spool is not None:
+            data = spool
+        
+        # Drop duplicate outlets on the normalized key columns
+        if dedupe_keys:
+            if spool is not None:
+                stats = {}
+                spool = RecordSpool()
+                spool.extend(iter_deduplicated(data, dedupe_keys, dedupe_keep, stats))
+                data.close()
+                data, dropped = spool, stats['dropped']
+            else:
+                data, dropped = dedupe_records(data, dedupe_keys, dedupe_keep)
+            print(f"Duplicates removed ({', '.join(dedupe_keys)}, keep {dedupe_keep}): {dropped}")
+
+        if spool is not None:
+            # Stream rows from disk into a write-only workbook
+            write_excel_streaming(data, output_file, 'Sheet1', 'plain')
+            print(f"Data has been cleaned and saved to '{output_file}'")
+            print(f"Total records processed: {len(data)}")
+            if 'latitude' in data.columns and 'longitude' in data.columns:
+                valid_count = sum(1 for r in data if r.get('latitude') != '0.0' and r.get('longitude') != '0.0')
+                print(f"Records with valid coordinates: {valid_count}")
+        else:
+            # Convert to DataFrame and save
+            df = pd.DataFrame(data)
+            df.to_excel(output_file, index=False)
+            print(f"Data has been cleaned and saved to '{output_file}'")
+            print(f"Total records processed: {len(df)}")
+            
+            # Display some statistics
+            if 'latitude' in df.columns and 'longitude' in df.columns:
+                valid_coords = df[(df['latitude'] != '0.0') & (df['longitude'] != '0.0')]
+                print(f"Records with valid coordinates: {len(valid_coords)}")
+
+        # Flag outlets registered at (nearly) the same location
+        if cluster_radius:
+            clusters, missing = find_coordinate_clusters(data, cluster_radius)
+            report_file = output_file[:-len('.xlsx')] + '-clusters.xlsx'
+            write_cluster_report(data, clusters, missing, report_file)
+            flagged = sum(len(c) for c in clusters)
+            print(f"Coordinate clusters within {cluster_radius} m: {len(clusters)} ({flagged} records), "
+                  f"{len(missing)} records without valid coordinates -> '{report_file}'")
+        print_cleaner_cache_stats(merge_cache_stats(worker_stats, cleaner_cache_stats()))
+
+        if spool is not None:
+            spool.close()
+        if state is not None:
+            state.clear()
+        return True
         
     except json.JSONDecodeError as e:
         print(f"Error: Invalid JSON format in '{input_file}': {e}")
+        return False
     except Exception as e:
         print(f"Error processing data: {e}")
+        return False
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean outlet JSON data and save it as Excel")
+    parser.add_argument('filename', nargs='?', help="input JSON file")
+    parser.add_argument('--dedupe-keys', help="comma separated key columns for duplicate removal, e.g. name,phone,rekening")
+    parser.add_argument('--cluster-radius', type=float, default=None, help="report outlets within this many metres of each other")
+    parser.add_argument('--checkpoint', action='store_true', help="commit cleaned chunks so an interrupted run can resume")
+    parser.add_argument('--chunk-size', type=int, default=None, help=f"records per chunk (default: {CHECKPOINT_CHUNK_SIZE}, {PARALLEL_CHUNK_SIZE} with --workers)")
+    parser.add_argument('--schema', help="template name whose first run fixes the expected header; later runs with a changed header fail ('auto' only records the header)")
+    parser.add_argument('--workers', type=int, default=1, help="clean chunks in this many processes, 0 = one per CPU (default: 1); "
+                             "each worker holds two chunks, and copying chunks to workers limits the speedup")
+    parser.add_argument('--memory-limit', help="e.g. 2G; spill to disk when the estimated working set is larger")
+    parser.add_argument('--cache-size', type=int, default=None, help=f"values memoized per cleaner, 0 disables (default: {DEFAULT_CACHE_SIZE})")
+    parser.add_argument('--keep', choices=['first', 'last'], default='first', help="which duplicate to keep (default: first)")
+    parser.add_argument('--quiet', action='store_true', help="no live progress output (for cron jobs)")
+    args = parser.parse_args()
+
+    dedupe_keys = [k.strip() for k in args.dedupe_keys.split(',') if k.strip()] if args.dedupe_keys else None
 
-if __name__ == "__main__":
     # Check if filename is provided as command line argument
-    if len(sys.argv) > 1:
-        filename = sys.argv[1]
-        print(f"Processing file: {filename}")
-        process_data(filename)
+    if args.filename:
+        print(f"Processing file: {args.filename}")
+        process_data(args.filename, dedupe_keys, args.keep, args.cache_size, args.cluster_radius,
+                     args.checkpoint, args.chunk_size, args.memory_limit, args.quiet, args.workers, args.schema)
     else:
-        print("Usage: python datacleansing.py <json_filename>")
+        print("Usage: python datacleansing.py <json_filename> [--dedupe-keys name,phone] [--keep first|last]")
         print("Example: python datacleansing.py data.json")
         print("Using default file: Aqua haier.json")
-        process_data()
\ No newline at end of file
+        process_data(dedupe_keys=dedupe_keys, dedupe_keep=args.keep, cache_size=args.cache_size,
+                     cluster_radius=args.cluster_radius, checkpoint=args.checkpoint,
+                     chunk_size=args.chunk_size, memory_limit=args.memory_limit, quiet=args.quiet,
+                     workers=args.workers, schema=args.schema)
+
+if __name__ == "__main__":
+    main()
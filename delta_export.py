@@ -0,0 +1,177 @@
+import json
+import hashlib
+import argparse
+import pandas as pd
+from datacleansing import record_key_digest
+from record_io import load_records, write_records, is_excel_file
+from exceltojson import CustomJSONEncoder
+
+
+def row_digest(record, ignore_columns=()):
+    """Hash the full content of a record (key order independent)"""
+    if ignore_columns:
+        record = {k: v for k, v in record.items() if k not in ignore_columns}
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, cls=CustomJSONEncoder)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).digest()
+
+
+def changed_fields(before, after, ignore_columns=()):
+    """List the columns whose value differs between two versions of a record"""
+    columns = list(after) + [c for c in before if c not in after]
+    return [c for c in columns if c not in ignore_columns and before.get(c) != after.get(c)]
+
+
+def compute_delta(previous, current, key_columns, ignore_columns=()):
+    """Compare two record lists keyed on key_columns.
+
+    Only digests and positions of the previous records are indexed; full
+    records are only compared field by field when their row hashes differ.
+    Records sharing a key are kept as a list and paired in two passes:
+    identical rows first, then the remaining rows in file order, so no row
+    of a duplicated key is lost. Records without any key value can only be
+    matched on identical content; otherwise they count as added/removed.
+    Returns a dict with 'added', 'removed' and 'changed' lists plus counts.
+    """
+    ignore_columns = set(ignore_columns)
+    index = {}     # key digest -> [(row digest, position), ...] in file order
+    unkeyed = {}   # row digest -> [position, ...] of records without a key
+    duplicates = 0
+    missing_keys = 0
+    for pos, record in enumerate(previous):
+        if not isinstance(record, dict):
+            continue
+        row = row_digest(record, ignore_columns)
+        digest = record_key_digest(record, key_columns)
+        if digest is None:
+            missing_keys += 1
+            unkeyed.setdefault(row, []).append(pos)
+            continue
+        rows = index.setdefault(digest, [])
+        if rows:
+            duplicates += 1
+        rows.append((row, pos))
+
+    # First pass: identical rows are unchanged, whatever their order
+    added, pending = [], []
+    unchanged = 0
+    seen = set()
+    for cur_pos, record in enumerate(current):
+        if not isinstance(record, dict):
+            continue
+        row = row_digest(record, ignore_columns)
+        digest = record_key_digest(record, key_columns)
+        if digest is None:
+            missing_keys += 1
+            if unkeyed.get(row):
+                unkeyed[row].pop(0)
+                unchanged += 1
+            else:
+                added.append((cur_pos, record))
+            continue
+        if digest in seen:
+            duplicates += 1
+        seen.add(digest)
+        rows = index.get(digest, [])
+        match = next((i for i, (prev_row, _) in enumerate(rows) if prev_row == row), None)
+        if match is None:
+            pending.append((cur_pos, record, digest))
+        else:
+            rows.pop(match)
+            unchanged += 1
+
+    # Second pass: pair what is left of each key in file order
+    changed = []
+    for cur_pos, record, digest in pending:
+        rows = index.get(digest)
+        if not rows:
+            added.append((cur_pos, record))
+            continue
+        _, pos = rows.pop(0)
+        before = previous[pos]
+        changed.append({
+            'key': {column: record.get(column) for column in key_columns},
+            'fields': changed_fields(before, record, ignore_columns),
+            'before': before,
+            'after': record,
+        })
+
+    removed_positions = [pos for rows in index.values() for _, pos in rows]
+    removed_positions += [pos for positions in unkeyed.values() for pos in positions]
+    return {
+        'added': [record for _, record in sorted(added, key=lambda e: e[0])],
+        'removed': [previous[pos] for pos in sorted(removed_positions)],
+        'changed': changed,
+        'unchanged': unchanged,
+        'duplicate_keys': duplicates,
+        'missing_keys': missing_keys,
+    }
+
+
+def write_delta(delta, output_file, profile=None):
+    """Write a delta as JSON, or as an Excel workbook with one sheet per kind"""
+    if not is_excel_file(output_file):
+        payload = {kind: delta[kind] for kind in ('added', 'removed', 'changed')}
+        write_records(payload, output_file)
+        return
+
+    from openpyxl import Workbook
+    from excel_styles import add_styled_sheet
+    changed_rows = [{**c['after'], 'changed_fields': ', '.join(c['fields'])} for c in delta['changed']]
+    workbook = Workbook(write_only=True)
+    for sheet_name, rows in (('added', delta['added']),
+                             ('removed', delta['removed']),
+                             ('changed', changed_rows)):
+        add_styled_sheet(workbook, sheet_name, pd.DataFrame(rows), profile)
+    workbook.save(output_file)
+
+
+def delta_export(previous_file, current_file, key_columns, output_file=None,
+                 ignore_columns=(), clean=False, profile=None):
+    """Export only the added, removed and changed records between two dataset versions"""
+    try:
+        if output_file is None:
+            output_file = 'delta.json'
+
+        print(f"Reading previous version: {previous_file}")
+        previous = load_records(previous_file, clean=clean)
+        print(f"Reading current version: {current_file}")
+        current = load_records(current_file, clean=clean)
+
+        delta = compute_delta(previous, current, key_columns, ignore_columns)
+        write_delta(delta, output_file, profile)
+
+        print(f"✅ Delta saved to {output_file}")
+        print(f"➕ Added: {len(delta['added'])}")
+        print(f"➖ Removed: {len(delta['removed'])}")
+        print(f"✏️  Changed: {len(delta['changed'])}")
+        print(f"= Unchanged: {delta['unchanged']}")
+        if delta['duplicate_keys']:
+            print(f"Warning: {delta['duplicate_keys']} records share a key with an earlier record "
+                  f"({', '.join(key_columns)}); rows of the same key are matched on identical "
+                  f"content first, then in file order")
+        if delta['missing_keys']:
+            print(f"Warning: {delta['missing_keys']} records have no value in {', '.join(key_columns)}; "
+                  f"they only match identical rows and are otherwise reported as added/removed")
+        return delta
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export only the records that changed between two JSON/Excel files")
+    parser.add_argument('previous', help="previous JSON or Excel file")
+    parser.add_argument('current', help="current JSON or Excel file")
+    parser.add_argument('--keys', required=True, help="comma separated key columns, e.g. id or name,client")
+    parser.add_argument('--output', default='delta.json', help="output .json or .xlsx (default: delta.json)")
+    parser.add_argument('--ignore', default='', help="comma separated columns to ignore when comparing")
+    parser.add_argument('--clean', action='store_true', help="apply datacleansing rules to JSON inputs first")
+    args = parser.parse_args()
+
+    key_columns = [k.strip() for k in args.keys.split(',') if k.strip()]
+    ignore_columns = [k.strip() for k in args.ignore.split(',') if k.strip()]
+    delta_export(args.previous, args.current, key_columns, args.output, ignore_columns, args.clean)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import json
+from datetime import datetime, date
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle, PatternFill, Alignment, Font, Border, Side
+from openpyxl.utils import get_column_letter
+
+# Styling profiles for the JSON -> Excel converters.
+# Each profile is registered once per workbook as named styles, so every
+# cell only carries a reference to a shared style instead of its own
+# Alignment/PatternFill objects.
+STYLE_PROFILES = {
+    'default': {
+        'header_color': '10B4B1',
+        'header_align': 'center',
+        'wrap_text': True,
+        'max_width': 50,
+        'freeze_panes': 'A2',
+    },
+    'compact': {
+        'header_color': '10B4B1',
+        'header_align': 'center',
+        'wrap_text': False,
+        'max_width': 30,
+        'freeze_panes': 'A2',
+    },
+    'wide': {
+        'header_color': '10B4B1',
+        'header_align': 'center',
+        'wrap_text': True,
+        'max_width': 80,
+        'freeze_panes': 'A2',
+    },
+    'plain': {
+        'header_color': None,
+        'header_align': None,
+        'wrap_text': False,
+        'max_width': 50,
+        'freeze_panes': None,
+    },
+}
+
+DEFAULT_PROFILE = 'default'
+
+
+def get_style_profile(profile=None):
+    """Return the profile settings for a profile name (or dict)"""
+    if profile is None:
+        profile = DEFAULT_PROFILE
+    if isinstance(profile, dict):
+        return {**STYLE_PROFILES[DEFAULT_PROFILE], **profile}
+    if profile not in STYLE_PROFILES:
+        raise ValueError(f"Unknown style profile '{profile}'. "
+                         f"Available: {', '.join(sorted(STYLE_PROFILES))}")
+    return STYLE_PROFILES[profile]
+
+
+def _profile_key(profile):
+    if isinstance(profile, dict):
+        return 'custom'
+    return profile or DEFAULT_PROFILE
+
+
+def register_named_styles(workbook, profile=None):
+    """Register the header/body named styles of a profile once per workbook"""
+    settings = get_style_profile(profile)
+    key = _profile_key(profile)
+    header_name = f"{key}_header"
+    body_name = f"{key}_body"
+
+    existing = set(workbook.named_styles)
+    if header_name not in existing:
+        thin = Side(style='thin')
+        header = NamedStyle(name=header_name)
+        header.font = Font(bold=True)
+        header.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        if settings['header_color']:
+            argb = 'FF' + settings['header_color'].upper()
+            header.fill = PatternFill(start_color=argb,
+                                      end_color=argb,
+                                      fill_type='solid')
+        header.alignment = Alignment(horizontal=settings['header_align'],
+                                     vertical='center',
+                                     wrap_text=settings['wrap_text'])
+        workbook.add_named_style(header)
+
+    if body_name not in existing:
+        body = NamedStyle(name=body_name)
+        body.alignment = Alignment(vertical='center',
+                                   wrap_text=settings['wrap_text'])
+        workbook.add_named_style(body)
+
+    return header_name, body_name
+
+
+def column_widths(df, max_width):
+    """Compute capped column widths from a DataFrame, one pass per column"""
+    widths = []
+    for column in df.columns:
+        max_length = len(str(column))
+        if len(df):
+            longest = df[column].astype(str).str.len().max()
+            if longest > max_length:
+                max_length = int(longest)
+        # Set column width with some padding
+        widths.append(min(max_length + 2, max_width))
+    return widths
+
+
+def excel_value(value):
+    """Convert a DataFrame/record value to something a cell accepts"""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return None if isinstance(value, float) and value != value else value
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    if value is pd.NaT:
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if hasattr(value, 'item'):
+        # numpy scalar
+        return excel_value(value.item())
+    return value
+
+
+# Date formats pandas' Excel writer uses, kept so output looks the same
+DATETIME_FORMAT = 'YYYY-MM-DD HH:MM:SS'
+DATE_FORMAT = 'YYYY-MM-DD'
+
+
+def styled_cell(worksheet, value, style_name):
+    """Write-only cell carrying a named style"""
+    cell = WriteOnlyCell(worksheet)
+    cell.style = style_name
+    cell.value = excel_value(value)
+    if isinstance(cell.value, datetime):
+        cell.number_format = DATETIME_FORMAT
+    elif isinstance(cell.value, date):
+        cell.number_format = DATE_FORMAT
+    return cell
+
+
+def add_styled_sheet(workbook, sheet_name, df, profile=None):
+    """Append df as a styled sheet to a write-only workbook.
+
+    Column widths and freeze panes are set once per column/sheet. Every
+    cell is created with the shared header or body style as it is written,
+    which is the only way to style cells that hold data: a column style
+    only applies to cells that do not exist yet. There is no second pass
+    over the sheet and no style object per cell.
+    """
+    settings = get_style_profile(profile)
+    worksheet = workbook.create_sheet(sheet_name)
+    header_name, body_name = register_named_styles(workbook, profile)
+
+    for col_idx, width in enumerate(column_widths(df, settings['max_width']), start=1):
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = width
+    if settings['freeze_panes']:
+        worksheet.freeze_panes = settings['freeze_panes']
+
+    worksheet.append([styled_cell(worksheet, name, header_name) for name in df.columns])
+    for row in df.itertuples(index=False, name=None):
+        worksheet.append([styled_cell(worksheet, value, body_name) for value in row])
+    return worksheet
+
+
+def write_styled_excel(df, excel_file, sheet_name, profile=None):
+    """Write df to excel_file in one styled pass through a write-only workbook"""
+    workbook = Workbook(write_only=True)
+    add_styled_sheet(workbook, sheet_name, df, profile)
+    workbook.save(excel_file)
@@ -1,11 +1,27 @@
 import pandas as pd
 import json
-import sys
 from pathlib import Path
 from openpyxl import load_workbook
+from openpyxl.cell import Cell
+from openpyxl.cell.read_only import ReadOnlyCell
 from datetime import datetime, date
 import re
 import numpy as np
+import os
+import glob
+import time
+import io
+import argparse
+import importlib.util
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from checkpoint import Checkpoint, file_fingerprint
+from record_io import open_text, strip_compression, compression_of
+from spill import RecordSpool, exceeds_memory_limit, write_json_streaming
+from cleaner_cache import (memoized_cleaner, configure_cleaner_cache, print_cleaner_cache_stats,
+                           cleaner_cache_stats, cache_stats_delta, merge_cache_stats, DEFAULT_CACHE_SIZE)
+from progress import ProgressReporter
+from schema_profiles import DATE_FORMATS, PROFILE_SAMPLE_ROWS, resolve_schema, schema_label
 
 class CustomJSONEncoder(json.JSONEncoder):
     """Custom JSON encoder to handle pandas/numpy types"""
@@ -70,10 +86,14 @@ def rgb_to_color_name(rgb_value):
 
 def get_cell_color(cell):
     """Extract color from cell - simplified approach"""
+    return get_fill_color(cell.fill)
+
+def get_fill_color(fill):
+    """Extract the color of a fill (RGB, indexed or theme)"""
     try:
         # Check fill color first
-        if cell.fill and cell.fill.start_color:
-            color_obj = cell.fill.start_color
+        if fill and fill.start_color:
+            color_obj = fill.start_color
             
             # Try RGB first
             if hasattr(color_obj, 'rgb') and color_obj.rgb:
@@ -128,18 +148,24 @@ def get_cell_color(cell):
     
     return None
 
-def format_birth_date(date_value):
-    """Format birth_date to yyyy-mm-dd format"""
+@memoized_cleaner
+def parse_birth_date(date_value):
+    """Format birth_date to yyyy-mm-dd format.
+
+    Returns (value, parsed); parsed is False when no format matched and the
+    original text is kept. Callers print the warning, so cache hits still
+    report every bad row.
+    """
     if pd.isna(date_value) or date_value is None or str(date_value).strip() == '':
-        return None
+        return None, True
     
     # Handle pandas Timestamp objects first
     if isinstance(date_value, pd.Timestamp):
-        return date_value.strftime('%Y-%m-%d')
+        return date_value.strftime('%Y-%m-%d'), True
     
     # If it's already a datetime object (from pandas)
     if isinstance(date_value, (datetime, date)):
-        return date_value.strftime('%Y-%m-%d')
+        return date_value.strftime('%Y-%m-%d'), True
     
     # Convert to string first
     date_str = str(date_value).strip()
@@ -147,34 +173,42 @@ def format_birth_date(date_value):
     # If already in yyyy-mm-dd format, return as is
     yyyy_mm_dd_pattern = r'^\d{4}-\d{2}-\d{2}$'
     if re.match(yyyy_mm_dd_pattern, date_str):
-        return date_str
+        return date_str, True
     
     # Try different date formats
-    date_formats = [
-        '%m/%d/%Y',    # 9/15/1997, 12/19/1997
-        '%m/%d/%y',    # 9/15/97, 12/19/97
-        '%Y-%m-%d',    # 1995-01-12, 1998-04-08
-        '%d/%m/%Y',    # 19/4/1997
-        '%d/%m/%y',    # 19/4/97
-        '%Y/%m/%d',    # 1997/9/15
-        '%m-%d-%Y',    # 9-15-1997
-        '%d-%m-%Y',    # 15-9-1997
-    ]
-    
-    for fmt in date_formats:
+    for fmt in DATE_FORMATS:
         try:
             parsed_date = datetime.strptime(date_str, fmt)
-            return parsed_date.strftime('%Y-%m-%d')
+            return parsed_date.strftime('%Y-%m-%d'), True
         except ValueError:
             continue
     
     # If nothing works, try pandas to_datetime as last resort
     try:
         parsed_date = pd.to_datetime(date_str, infer_datetime_format=True)
-        return str(parsed_date.strftime('%Y-%m-%d'))
+        return str(parsed_date.strftime('%Y-%m-%d')), True
     except:
+        return str(date_str), False
+
+def format_birth_date(date_value):
+    """Format birth_date to yyyy-mm-dd format, warning about unparseable values"""
+    value, parsed = parse_birth_date(date_value)
+    if not parsed:
         print(f"Warning: Could not parse date '{date_value}', keeping original value")
-        return str(date_str)
+    return value
+
+def parse_date_as(date_value, fmt):
+    """parse_birth_date with the template's known input format tried first.
+
+    Used with a cached schema profile; ambiguous dates such as 9/10/1997 follow the
+    column's format instead of the first format that happens to parse.
+    """
+    if isinstance(date_value, str):
+        try:
+            return datetime.strptime(date_value.strip(), fmt).strftime('%Y-%m-%d'), True
+        except ValueError:
+            pass
+    return parse_birth_date(date_value)
 
 def clean_record_values(record):
     """Clean all values in a record to ensure JSON serialization"""
@@ -194,68 +228,517 @@ def clean_record_values(record):
             cleaned_record[key] = value
     return cleaned_record
 
-def excel_to_json(excel_file: str, json_file: str = None) -> None:
-    """Convert Excel to JSON with color detection from first column of each row"""
+def normalize_rgb(rgb_value):
+    """Normalize an RGB/ARGB value to 6 uppercase hex digits, None if invalid"""
+    clean_rgb = ''.join(c for c in str(rgb_value).upper() if c in '0123456789ABCDEF')
+    if len(clean_rgb) == 8:
+        # Remove alpha channel (FF prefix/suffix)
+        clean_rgb = clean_rgb[-6:] if clean_rgb.startswith('FF') else clean_rgb[:6]
+    return clean_rgb if len(clean_rgb) == 6 else None
+
+def load_palette(palette_file: str) -> dict:
+    """Load a custom {"RRGGBB": "label"} palette from a JSON file"""
+    with open(palette_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class FillLabeler:
+    """Resolves cells to (raw color, label) through the workbook fill table.
+
+    Every fill is resolved once up front, so a cell lookup is just its fill
+    id plus a list index, however many color columns are extracted.
+    """
+    def __init__(self, workbook, palette: dict = None):
+        self.palette = {normalize_rgb(k): v for k, v in (palette or {}).items()}
+        self._fills = [self._resolve(fill) for fill in workbook._fills]
+
+    def _resolve(self, fill):
+        # Unfilled cells carry a default '00000000' color that must not match a black palette entry
+        if fill.fill_type is None:
+            return None, None
+        raw_color = get_fill_color(fill)
+        if not raw_color:
+            return None, None
+        rgb = normalize_rgb(raw_color)
+        if rgb in self.palette:
+            return raw_color, self.palette[rgb]
+        return raw_color, rgb_to_color_name(raw_color)
+
+    def lookup(self, cell):
+        if isinstance(cell, ReadOnlyCell):
+            fill_id = cell.style_array.fillId
+        elif isinstance(cell, Cell):
+            fill_id = cell._style.fillId if cell._style else 0
+        else:
+            # Empty or missing cell: no fill at all
+            return None, None
+        return self._fills[fill_id]
+
+def resolve_color_columns(columns, color_columns=None) -> list:
+    """Map color columns (1-based numbers or header names) to (column number, record key).
+
+    Column 1 keeps the historical 'color' key, other columns get 'color_<header>'.
+    """
+    columns = [str(c) for c in columns]
+    resolved = []
+    for column in color_columns or [1]:
+        if isinstance(column, str) and not column.isdigit():
+            if column not in columns:
+                raise ValueError(f"Color column '{column}' not found in sheet header")
+            number = columns.index(column) + 1
+        else:
+            number = int(column)
+        if number < 1:
+            raise ValueError(f"Invalid color column {column}")
+        header = columns[number - 1] if number <= len(columns) else str(number)
+        resolved.append((number, 'color' if number == 1 else f"color_{header}"))
+    return resolved
+
+def finish_record(record: dict, color_cells: list, labeler: FillLabeler, date_format: str = None,
+                  row_number: int = None) -> dict:
+    """Clean a raw DataFrame record and add color info from its color column cells.
+
+    row_number is the sheet row, used in warnings.
+    """
+    # Clean all record values first to handle pandas/numpy types
+    record = clean_record_values(record)
+    
+    # Format birth_date if it exists
+    if 'birth_date' in record:
+        original = record['birth_date']
+        if date_format:
+            record['birth_date'], parsed = parse_date_as(original, date_format)
+        else:
+            record['birth_date'], parsed = parse_birth_date(original)
+        if not parsed:
+            print(f"Warning: Could not parse date '{original}' in row {row_number}, keeping original value")
+    
+    for key, cell in color_cells:
+        raw_color, color_name = labeler.lookup(cell)
+        record[key] = None
+        # If the column has color, add to record
+        if raw_color:
+            if color_name:
+                record[key] = color_name
+        elif key == 'color':
+            # If no color detected from cell, check if warna exists and copy to color
+            if 'warna' in record and record['warna']:
+                record['color'] = record['warna']
+    return record
+
+def _row_color_cells(row, color_columns):
+    """Pick the (key, cell) pairs of the color columns from an iter_rows row"""
+    return [(key, row[number - 1] if number <= len(row) else None) for number, key in color_columns]
+
+# pandas engines for cell values, fastest first. Fill colors are always read
+# with openpyxl, since the faster readers do not expose cell styles.
+EXCEL_ENGINES = ('calamine', 'openpyxl')
+_ENGINE_MODULES = {'calamine': 'python_calamine', 'openpyxl': 'openpyxl'}
+
+def available_engines() -> list:
+    """Value reader engines installed in this environment"""
+    return [e for e in EXCEL_ENGINES if importlib.util.find_spec(_ENGINE_MODULES[e]) is not None]
+
+def resolve_engine(engine: str = None):
+    """Pick the pandas engine for reading values.
+
+    None or 'auto' uses calamine when installed and otherwise leaves the
+    choice to pandas (openpyxl for .xlsx), as before.
+    """
+    if engine in (None, 'auto'):
+        return 'calamine' if 'calamine' in available_engines() else None
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"Unknown Excel engine '{engine}', use one of: auto, {', '.join(EXCEL_ENGINES)}")
+    if engine not in available_engines():
+        raise ImportError(f"Excel engine '{engine}' needs the {_ENGINE_MODULES[engine].replace('_', '-')} package")
+    return engine
+
+def read_excel_frame(excel_file: str, engine: str = None, sheet: str = None) -> pd.DataFrame:
+    """Read a sheet's values (default: the first sheet) with the selected engine"""
+    return pd.read_excel(excel_file, sheet_name=0 if sheet is None else sheet, engine=resolve_engine(engine))
+
+def schema_date_format(df: pd.DataFrame, schema: str = None):
+    """Resolve the sheet's schema profile (see schema_profiles); returns its birth_date format"""
+    if not schema:
+        return None
+    profile, cached = resolve_schema(df.columns, df.head(PROFILE_SAMPLE_ROWS).to_dict('records'), schema)
+    print(schema_label(profile, cached))
+    return profile['date_formats'].get('birth_date')
+
+def read_excel_records(excel_file: str, color_columns: list = None, palette: dict = None,
+                       quiet: bool = True, engine: str = None, schema: str = None) -> list:
+    """Read an Excel file into cleaned records with color detection per row.
+
+    color_columns: column numbers or header names to read fill colors from
+    (default: the first column). palette: optional {"RRGGBB": "label"} map
+    checked before the built-in color names. quiet=False shows live progress.
+    engine: value reader, see resolve_engine. schema: 'auto' or a template
+    name to reuse the cached birth_date format of the header (template names
+    are also checked for a changed header).
+    """
+    df = read_excel_frame(excel_file, engine)
+    date_format = schema_date_format(df, schema)
+    workbook = load_workbook(excel_file)
+    worksheet = workbook.active        
+    labeler = FillLabeler(workbook, palette)
+    color_columns = resolve_color_columns(df.columns, color_columns)
+    max_col = max(number for number, _ in color_columns)
+    records = df.to_dict('records')
+    progress = ProgressReporter(len(records), 'Reading colors', 'rows', quiet)
+    # Process each row (skip header)
+    rows = worksheet.iter_rows(min_row=2, max_row=len(records) + 1, max_col=max_col)
+    for i, (record, row) in enumerate(zip(records, rows)):
+        # Update the record in the list
+        records[i] = finish_record(record, _row_color_cells(row, color_columns), labeler, date_format, i + 2)
+        progress.update()
+    progress.finish()
+    return records
+
+def iter_excel_records(excel_file: str, chunk_rows: int = 10_000, color_columns: list = None,
+                       palette: dict = None, quiet: bool = True, engine: str = None,
+                       schema: str = None, sheet: str = None):
+    """Like read_excel_records, but yields records chunk by chunk.
+
+    The workbook is opened read-only and only the color columns are streamed,
+    so the full openpyxl cell model and the record list are never built.
+    sheet selects a worksheet by name instead of the first/active one.
+    """
+    df = read_excel_frame(excel_file, engine, sheet)
+    date_format = schema_date_format(df, schema)
+    workbook = load_workbook(excel_file, read_only=True)
+    try:
+        labeler = FillLabeler(workbook, palette)
+        color_columns = resolve_color_columns(df.columns, color_columns)
+        max_col = max(number for number, _ in color_columns)
+        worksheet = workbook.active if sheet is None else workbook[sheet]
+        rows = worksheet.iter_rows(min_row=2, max_row=len(df) + 1, max_col=max_col)
+        progress = ProgressReporter(len(df), 'Reading colors', 'rows', quiet)
+        for start in range(0, len(df), chunk_rows):
+            for i, record in enumerate(df.iloc[start:start + chunk_rows].to_dict('records'), start=start):
+                row = next(rows, ())
+                progress.update()
+                yield finish_record(record, _row_color_cells(row, color_columns), labeler, date_format, i + 2)
+        progress.finish()
+    finally:
+        workbook.close()
+
+def excel_to_json(excel_file: str, json_file: str = None, cache_size: int = None,
+                  memory_limit: str = None, color_columns: list = None,
+                  palette: dict = None, quiet: bool = False, engine: str = None,
+                  schema: str = None) -> bool:
+    """Convert Excel to JSON with color detection from first column of each row.
+
+    color_columns/palette select other color columns and custom labels (see
+    read_excel_records). With memory_limit (e.g. '2G') and a larger estimated
+    working set, records are streamed through a disk spool and written to
+    JSON one at a time. quiet suppresses the live progress line on stderr.
+    engine: 'auto' (default), 'calamine' or 'openpyxl' for reading values.
+    schema: 'auto' or a template name; a template name whose header changed fails the conversion.
+    """
     try:
         if not Path(excel_file).exists():
             print(f"Error: File {excel_file} not found!")
-            return
+            return False
         
         print(f"Reading {excel_file}...")
-        df = pd.read_excel(excel_file)
-        workbook = load_workbook(excel_file)
-        worksheet = workbook.active        
-        records = df.to_dict('records')
-        # Process each row
-        for i, record in enumerate(records):
-            row_index = i + 2  # Skip header
-            
-            # Clean all record values first to handle pandas/numpy types
-            record = clean_record_values(record)
-            
-            # Format birth_date if it exists
-            if 'birth_date' in record:
-                record['birth_date'] = format_birth_date(record['birth_date'])
-            
-            # Check color of the first column cell only
-            first_cell = worksheet.cell(row=row_index, column=1)
-            first_cell_color = get_cell_color(first_cell)
-            record['color'] = None
-            # If first column has color, add to record
-            if first_cell_color:
-                color_name = rgb_to_color_name(first_cell_color)
-                if color_name:
-                    # record['warna'] = color_name
-                    record['color'] = color_name  # Add color key with same value
-            else:
-                # If no color detected from cell, check if warna exists and copy to color
-                if 'warna' in record and record['warna']:
-                    record['color'] = record['warna']
-                else:
-                    record['color'] = None  # Set to None if no color info available
-            
-            # Update the record in the list
-            records[i] = record
-          # Save to JSON
+        configure_cleaner_cache(DEFAULT_CACHE_SIZE if cache_size is None else cache_size)
         if json_file is None:
             json_file = Path(excel_file).stem + '_colored.json'
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(records, f, indent=2, ensure_ascii=False, cls=CustomJSONEncoder)
+
+        if exceeds_memory_limit(excel_file, memory_limit):
+            print(f"Estimated working set exceeds memory limit {memory_limit}, spilling to disk")
+            with RecordSpool() as records:
+                records.extend(iter_excel_records(excel_file, color_columns=color_columns,
+                                                  palette=palette, quiet=quiet, engine=engine,
+                                                  schema=schema))
+                write_json_streaming(records, json_file)
+                colored_counts = count_colored(records)
+                total = len(records)
+        else:
+            records = read_excel_records(excel_file, color_columns, palette, quiet, engine, schema)
+            # Save to JSON
+            with open_text(json_file, 'w') as f:
+                json.dump(records, f, indent=2, ensure_ascii=False, cls=CustomJSONEncoder)
+            colored_counts = count_colored(records)
+            total = len(records)
         
-        colored_count = sum(1 for r in records if 'color' in r and r['color'])
         print(f"✅ Converted to {json_file}")
-        print(f"📊 {colored_count}/{len(records)} records have color info from first column")
+        for key, colored_count in colored_counts.items():
+            source = "first column" if key == 'color' else f"column '{key[len('color_'):]}'"
+            print(f"📊 {colored_count}/{total} records have color info from {source}")
+        print_cleaner_cache_stats()
+        return True
         
     except Exception as e:
         print(f"❌ Error: {str(e)}")
+        return False
+
+def count_colored(records) -> dict:
+    """Count records with a color label per color key"""
+    counts = {}
+    for record in records:
+        for key, value in record.items():
+            if key == 'color' or key.startswith('color_'):
+                counts[key] = counts.get(key, 0) + (1 if value else 0)
+    return counts
+
+def find_excel_files(source: str) -> list:
+    """List workbooks from a folder or a glob pattern (Excel lock files skipped)"""
+    if os.path.isdir(source):
+        pattern = os.path.join(source, '*.xls*')
+    else:
+        pattern = source
+    return sorted(f for f in glob.glob(pattern)
+                  if not os.path.basename(f).startswith('~$') and os.path.isfile(f))
+
+def _convert_workbook(task):
+    """Worker: convert one workbook quietly, return (file, ok, seconds, log)"""
+    excel_file, json_file, options = task
+    log = io.StringIO()
+    start = time.perf_counter()
+    with redirect_stdout(log):
+        ok = excel_to_json(excel_file, json_file, **options)
+    return excel_file, ok, time.perf_counter() - start, log.getvalue()
+
+def batch_excel_to_json(source: str, output_folder: str = 'data-json', workers: int = None,
+                        cache_size: int = None, checkpoint: bool = False,
+                        memory_limit: str = None, color_columns: list = None,
+                        palette: dict = None, compression: str = None, quiet: bool = False,
+                        engine: str = None, schema: str = None) -> None:
+    """Convert every workbook in a folder (or glob) to JSON across a process pool.
+
+    With checkpoint=True, converted workbooks are recorded so a rerun after a
+    crash only converts the remaining (or changed) files. compression ('gz',
+    'bz2', 'xz' or 'zst') writes compressed JSON files. Progress is reported
+    per file; quiet turns it off.
+    """
+    excel_files = find_excel_files(source)
+    if not excel_files:
+        print(f"No Excel files found for '{source}'!")
+        return
+
+    # Create output folder if it doesn't exist
+    if not os.path.exists(output_folder):
+        os.makedirs(output_folder)
+        print(f"Created output folder: {output_folder}")
+
+    state = None
+    skipped_count = 0
+    fingerprints = {f: file_fingerprint(f) for f in excel_files}
+    if checkpoint:
+        state = Checkpoint(os.path.join(output_folder, '.batch-checkpoint'),
+                           {'source': os.path.abspath(source), 'cache_size': cache_size,
+                            'color_columns': color_columns, 'palette': palette,
+                            'compression': compression, 'engine': engine, 'schema': schema})
+        pending = [f for f in excel_files if not state.is_done(f, fingerprints[f])]
+        skipped_count = len(excel_files) - len(pending)
+        excel_files = pending
+
+    # Workers never draw their own progress line, the parent reports per file
+    options = {'cache_size': cache_size, 'memory_limit': memory_limit,
+               'color_columns': color_columns, 'palette': palette, 'quiet': True,
+               'engine': engine, 'schema': schema}
+    suffix = '_colored.json' + (f".{compression}" if compression else '')
+    tasks = [(f, os.path.join(output_folder, Path(f).stem + suffix), options)
+             for f in excel_files]
+
+    print(f"Found {len(excel_files) + skipped_count} Excel files to convert...")
+    print("-" * 50)
+
+    success_count = 0
+    failed_count = 0
+    start = time.perf_counter()
+    progress = ProgressReporter(len(tasks), 'Converting', 'files', quiet)
+    if workers == 1:
+        results = map(_convert_workbook, tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_convert_workbook, tasks)
+    try:
+        for (excel_file, json_file, _), (_, ok, seconds, log) in zip(tasks, results):
+            progress.clear()
+            print(log, end='')
+            if ok:
+                success_count += 1
+                if state is not None:
+                    state.mark_done(excel_file, fingerprints[excel_file])
+                print(f"✓ Converted: {os.path.basename(excel_file)} -> {os.path.basename(json_file)} ({seconds:.2f}s)")
+            else:
+                failed_count += 1
+                errors = [line for line in log.splitlines() if 'Error' in line]
+                print(f"✗ Error converting {excel_file} ({seconds:.2f}s): {errors[-1] if errors else 'unknown error'}")
+            progress.update()
+        progress.finish()
+    finally:
+        if workers != 1:
+            executor.shutdown()
+
+    # Print summary
+    print("-" * 50)
+    print(f"Conversion Summary:")
+    print(f"✓ Successfully converted: {success_count} files")
+    print(f"✗ Failed to convert: {failed_count} files")
+    if skipped_count:
+        print(f"⏭️  Already converted (checkpoint): {skipped_count} files")
+    print(f"⏱️  Total time: {time.perf_counter() - start:.2f}s")
+    print(f"📁 JSON files saved in: {output_folder}")
+
+    # Keep the checkpoint while files still need converting
+    if state is not None and failed_count == 0:
+        state.clear()
+
+def list_sheets(excel_file: str) -> list:
+    """Worksheet names of a workbook, in tab order"""
+    workbook = load_workbook(excel_file, read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+def sheet_json_file(json_file: str, sheet: str) -> str:
+    """Per-sheet output name: 'out.json.gz' + 'Jan 2024' -> 'out_Jan_2024.json.gz'"""
+    base = strip_compression(json_file)
+    stem, ext = os.path.splitext(base)
+    safe = re.sub(r'[^\w.-]+', '_', sheet).strip('_') or 'sheet'
+    return f"{stem}_{safe}{ext}{compression_of(json_file) or ''}"
+
+def _read_sheet(task):
+    """Worker: read one sheet read-only, return (sheet, records, seconds, error, cache stats, log)"""
+    excel_file, sheet, options = task
+    start = time.perf_counter()
+    before = cleaner_cache_stats()
+    records, error = None, None
+    log = io.StringIO()
+    with redirect_stdout(log):
+        try:
+            records = list(iter_excel_records(excel_file, sheet=sheet, **options))
+        except Exception as e:
+            error = str(e)
+    return (sheet, records, time.perf_counter() - start, error,
+            cache_stats_delta(before, cleaner_cache_stats()), log.getvalue())
+
+def excel_sheets_to_json(excel_file: str, json_file: str = None, sheets: list = None,
+                         per_sheet: bool = False, workers: int = None, cache_size: int = None,
+                         color_columns: list = None, palette: dict = None, engine: str = None,
+                         schema: str = None, quiet: bool = False) -> bool:
+    """Convert all (or the selected) sheets of one workbook, sheets in parallel.
+
+    Each worker opens the workbook read-only and reads a single sheet. The
+    records go to one combined JSON file with a 'sheet' field, or with
+    per_sheet=True to one file per sheet (see sheet_json_file). Sheets keep
+    their tab order in the output whatever order the workers finish in, and
+    so do the warnings each worker printed.
+    """
+    try:
+        if not Path(excel_file).exists():
+            print(f"Error: File {excel_file} not found!")
+            return False
+
+        available = list_sheets(excel_file)
+        sheets = sheets or available
+        missing = [s for s in sheets if s not in available]
+        if missing:
+            print(f"Error: Sheet(s) not found in {excel_file}: {', '.join(missing)} "
+                  f"(available: {', '.join(available)})")
+            return False
+        if json_file is None:
+            json_file = Path(excel_file).stem + '_colored.json'
+        if per_sheet:
+            sheet_files = {}
+            for sheet in sheets:
+                sheet_files.setdefault(sheet_json_file(json_file, sheet), []).append(sheet)
+            clashes = ['/'.join(f"'{s}'" for s in same) for same in sheet_files.values() if len(same) > 1]
+            if clashes:
+                print(f"Error: Sheets would overwrite each other's output file: {', '.join(clashes)}")
+                return False
+
+        cache_size = DEFAULT_CACHE_SIZE if cache_size is None else cache_size
+        configure_cleaner_cache(cache_size)
+        workers = min(workers or os.cpu_count(), len(sheets))
+        options = {'color_columns': color_columns, 'palette': palette, 'engine': engine, 'schema': schema}
+        tasks = [(excel_file, sheet, options) for sheet in sheets]
+        print(f"Reading {len(sheets)} sheets of {excel_file} with {workers} workers...")
+
+        progress = ProgressReporter(len(sheets), 'Reading', 'sheets', quiet)
+        stats = {}
+        combined = []
+        failed = 0
+        if workers == 1:
+            results = map(_read_sheet, tasks)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=configure_cleaner_cache,
+                                           initargs=(cache_size,))
+            results = executor.map(_read_sheet, tasks)
+        try:
+            for sheet, records, seconds, error, sheet_stats, log in results:
+                merge_cache_stats(stats, sheet_stats)
+                progress.clear()
+                print(log, end='')
+                if error is not None:
+                    failed += 1
+                    print(f"✗ Sheet '{sheet}' ({seconds:.2f}s): {error}")
+                elif per_sheet:
+                    sheet_file = sheet_json_file(json_file, sheet)
+                    with open_text(sheet_file, 'w') as f:
+                        json.dump(records, f, indent=2, ensure_ascii=False, cls=CustomJSONEncoder)
+                    print(f"✓ Sheet '{sheet}': {len(records)} records -> {sheet_file} ({seconds:.2f}s)")
+                else:
+                    combined.extend({'sheet': sheet, **record} for record in records)
+                    print(f"✓ Sheet '{sheet}': {len(records)} records ({seconds:.2f}s)")
+                progress.update()
+            progress.finish()
+        finally:
+            if workers != 1:
+                executor.shutdown()
+
+        if not per_sheet and failed < len(sheets):
+            with open_text(json_file, 'w') as f:
+                json.dump(combined, f, indent=2, ensure_ascii=False, cls=CustomJSONEncoder)
+            print(f"✅ Converted {len(sheets) - failed} sheets ({len(combined)} records) to {json_file}")
+        print_cleaner_cache_stats(stats)
+        return failed == 0
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
 
 def main():
-    if len(sys.argv) > 1:
-        excel_file = sys.argv[1]
-        json_file = sys.argv[2] if len(sys.argv) > 2 else None
-        excel_to_json(excel_file, json_file)
+    parser = argparse.ArgumentParser(description="Convert Excel to JSON with color detection")
+    parser.add_argument('excel_file', nargs='?', help="Excel file to convert")
+    parser.add_argument('json_file', nargs='?', help="output JSON file")
+    parser.add_argument('--batch', metavar='SOURCE', help="convert every workbook in a folder or glob pattern")
+    parser.add_argument('--output-dir', default='data-json', help="output folder for --batch (default: data-json)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for --batch or --sheets (default: CPU count)")
+    parser.add_argument('--checkpoint', action='store_true', help="record converted files so an interrupted --batch run can resume")
+    parser.add_argument('--memory-limit', help="e.g. 2G; stream through a disk spool when the estimated working set is larger")
+    parser.add_argument('--color-columns', help="comma separated column numbers or headers to read colors from (default: 1)")
+    parser.add_argument('--palette', help="JSON file mapping RRGGBB to a label, checked before the built-in names")
+    parser.add_argument('--compress', choices=['gz', 'bz2', 'xz', 'zst'], help="compress the --batch JSON outputs")
+    parser.add_argument('--cache-size', type=int, default=None, help="values memoized per cleaner, 0 disables")
+    parser.add_argument('--quiet', action='store_true', help="no live progress output (for cron jobs)")
+    parser.add_argument('--schema', help="'auto' or a template name: cache the header profile and reuse its birth_date format; a template name also fails on a changed header")
+    parser.add_argument('--sheets', help="comma separated sheet names, or 'all', to convert several sheets of one workbook")
+    parser.add_argument('--per-sheet', action='store_true', help="with --sheets: write one JSON file per sheet instead of one combined file")
+    parser.add_argument('--engine', choices=('auto',) + EXCEL_ENGINES, default='auto', help="reader for cell values; colors always use openpyxl (default: auto)")
+    args = parser.parse_args()
+
+    color_columns = [c.strip() for c in args.color_columns.split(',') if c.strip()] if args.color_columns else None
+    palette = load_palette(args.palette) if args.palette else None
+
+    if args.batch:
+        batch_excel_to_json(args.batch, args.output_dir, args.workers, args.cache_size, args.checkpoint,
+                            args.memory_limit, color_columns, palette, args.compress, args.quiet,
+                            args.engine, args.schema)
+    elif args.excel_file and args.sheets:
+        sheets = None if args.sheets == 'all' else [s.strip() for s in args.sheets.split(',') if s.strip()]
+        excel_sheets_to_json(args.excel_file, args.json_file, sheets, args.per_sheet, args.workers,
+                             args.cache_size, color_columns, palette, args.engine, args.schema, args.quiet)
+    elif args.excel_file:
+        excel_to_json(args.excel_file, args.json_file, args.cache_size, args.memory_limit,
+                      color_columns, palette, args.quiet, args.engine, args.schema)
     else:
         print("Usage: python exceltojson.py <excel_file> [json_file]")
+        print("       python exceltojson.py --batch <folder|glob> [--output-dir data-json] [--workers N]")
+        print("       python exceltojson.py <excel_file> [json_file] --sheets all|Sheet1,Sheet2 [--per-sheet] [--workers N]")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,75 +1,46 @@
 import pandas as pd
 import json
 import os
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill, Alignment
-from openpyxl.utils import get_column_letter
+import argparse
+from excel_styles import write_styled_excel
+from record_io import open_text
+from spill import exceeds_memory_limit, write_excel_streaming
+from schema_profiles import resolve_json_schema, schema_label
 
-def convert_json_to_excel():
+# Export read when no input is given
+DEFAULT_JSON_FILE = 'client_outlet_202506031523.json'
+
+def convert_json_to_excel(profile=None, memory_limit=None, schema=None, json_file=DEFAULT_JSON_FILE):
     try:
-        json_file = 'client_outlet_202506031523.json'
         if not os.path.exists(json_file):
             raise FileNotFoundError(f"JSON file '{json_file}' not found")        # Read JSON file with UTF-8 encoding to handle special characters
-        with open(json_file, 'r', encoding='utf-8') as file:
+        with open_text(json_file) as file:
             data = json.load(file)
         
+        if schema:
+            # Known template: records key and styling come from its cached profile
+            records, schema_profile, cached = resolve_json_schema(data, schema, profile)
+            print(schema_label(schema_profile, cached))
+            profile = profile or schema_profile['styling']
         # Check if data is a list or dict
-        if isinstance(data, list):
+        elif isinstance(data, list):
             # If it's a list, use it directly
-            df = pd.DataFrame(data)
+            records = data
         elif isinstance(data, dict):
             # If it's a dict, get the first key's value
             query_key = list(data.keys())[0]
-            df = pd.DataFrame(data[query_key])
+            records = data[query_key]
         else:
             raise ValueError("JSON data must be either a list or a dictionary")
         
         # Export to Excel
         excel_file = 'excel-baru.xlsx'
-        df.to_excel(excel_file, index=False, sheet_name='Outlets')
-        
-        # Load workbook for formatting
-        wb = load_workbook(excel_file)
-        ws = wb['Outlets']
-        
-        # Define header color (10b4b1) - convert to RGB format
-        header_fill = PatternFill(start_color='FF10B4B1',
-                                end_color='FF10B4B1',
-                                fill_type='solid')
-        
-        # Format headers
-        for cell in ws[1]:
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center', 
-                                     vertical='center',
-                                     wrap_text=True)
-        
-        # Freeze pane below header
-        ws.freeze_panes = 'A2'
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = get_column_letter(column[0].column)
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            # Set column width with some padding
-            adjusted_width = min(max_length + 2, 50)  # Max width of 50
-            ws.column_dimensions[column_letter].width = adjusted_width
-            
-            # Set alignment for all cells in column
-            for cell in column:
-                cell.alignment = Alignment(vertical='center',
-                                        wrap_text=True)
-        
-        # Save the formatted workbook
-        wb.save(excel_file)
+        if exceeds_memory_limit(json_file, memory_limit):
+            # Too big for a DataFrame + workbook model: stream rows to a write-only workbook
+            write_excel_streaming(records, excel_file, 'Outlets', profile)
+        else:
+            # Write and style in one pass (shared named styles, O(columns))
+            write_styled_excel(pd.DataFrame(records), excel_file, 'Outlets', profile)
         print(f"Excel file '{excel_file}' has been created successfully!")
         
     except FileNotFoundError as e:
@@ -80,4 +51,10 @@ def convert_json_to_excel():
         print(f"An unexpected error occurred: {e}")
 
 if __name__ == "__main__":
-    convert_json_to_excel()
+    parser = argparse.ArgumentParser(description="Convert the outlet JSON export to a formatted Excel file")
+    parser.add_argument('profile', nargs='?', help="styling profile (default, compact, wide, plain)")
+    parser.add_argument('--input', default=DEFAULT_JSON_FILE, help=f"JSON export, may be .gz/.bz2/.xz/.zst compressed (default: {DEFAULT_JSON_FILE})")
+    parser.add_argument('--memory-limit', help="e.g. 2G; stream rows when the estimated working set is larger")
+    parser.add_argument('--schema', help="'auto' or a template name: cache the header profile and reuse its styling; a template name also fails on a changed header")
+    args = parser.parse_args()
+    convert_json_to_excel(args.profile, args.memory_limit, args.schema, args.input)
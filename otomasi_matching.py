@@ -1,37 +1,252 @@
 import json
+import os
+import re
+import argparse
+from record_io import records_from_json, load_records, is_excel_file, open_text, strip_compression
 
 # File paths
 user_terdampak_path = 'user_terdampak.json'
 data_user_old_path = 'data_user_old.json'
 output_path = 'matched_users.json'
+unmatched_path = 'unmatched_users.json'
 
-# Load user terdampak
-with open(user_terdampak_path, encoding='utf-8') as f:
-    user_terdampak = json.load(f)
-
-# Load data user old
-with open(data_user_old_path, encoding='utf-8') as f:
-    data_user_old = json.load(f)
-
-# Ambil semua nama dari user terdampak (pastikan key 'user' dan 'name')
-nama_terdampak = set()
-for u in user_terdampak.get('user', []):
-    name = u.get('name')
-    if name and isinstance(name, str):
-        nama_terdampak.add(name.strip().upper())
-
-# Cari kecocokan di data_user_old (key 'nama ')
-matched = []
-for d in data_user_old:
-    nama_old = d.get('nama ')
-    if nama_old and isinstance(nama_old, str):
-        if nama_old.strip().upper() in nama_terdampak:
-            matched.append(
-                d
-            )
-
-# Simpan hasil
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(matched, f, ensure_ascii=False, indent=2)
-
-print(f"Selesai. {len(matched)} data cocok disimpan di {output_path}")
+# semi keeps each matched left row once, unchanged (the original script's
+# behaviour); inner/left add one merged row per matching right row
+JOIN_MODES = ('semi', 'inner', 'left', 'anti')
+
+
+def normalize_upper(value):
+    """Trim and uppercase string values (the original name matching rule)"""
+    if value and isinstance(value, str):
+        return value.strip().upper() or None
+    return None
+
+
+def normalize_casefold(value):
+    """Collapse whitespace and ignore case, for any value type"""
+    if value is None:
+        return None
+    return ' '.join(str(value).split()).casefold() or None
+
+
+def normalize_digits(value):
+    """Keep digits only (phone, rekening, NIK)"""
+    if value is None:
+        return None
+    return re.sub(r'\D', '', str(value)) or None
+
+
+def normalize_date(value):
+    """Normalize dates to yyyy-mm-dd"""
+    from exceltojson import format_birth_date
+    if value is None:
+        return None
+    return format_birth_date(value)
+
+
+def normalize_raw(value):
+    """Match on the exact value"""
+    return None if value is None or value == '' else str(value)
+
+
+NORMALIZERS = {
+    'upper': normalize_upper,
+    'casefold': normalize_casefold,
+    'digits': normalize_digits,
+    'date': normalize_date,
+    'raw': normalize_raw,
+}
+
+
+def parse_key_spec(spec, default_normalizer='upper'):
+    """Parse 'nama :upper,birth_date:date' into [(column, normalizer), ...].
+
+    Column names are kept as written (e.g. 'nama ' with its trailing space).
+    """
+    keys = []
+    for part in spec.split(','):
+        column, normalizer = part, default_normalizer
+        if ':' in part:
+            head, tail = part.rsplit(':', 1)
+            if tail.strip() in NORMALIZERS:
+                column, normalizer = head, tail.strip()
+        if not column:
+            raise ValueError(f"Empty key column in '{spec}'")
+        keys.append((column, NORMALIZERS[normalizer]))
+    return keys
+
+
+def record_key(record, keys):
+    """Composite join key of a record, None if any key part is missing"""
+    parts = []
+    for column, normalizer in keys:
+        value = normalizer(record.get(column))
+        if value is None:
+            return None
+        parts.append(value)
+    return tuple(parts)
+
+
+def iter_records(path, container_key=None):
+    """Iterate the records of a JSON, JSON Lines or Excel file.
+
+    JSON Lines files are streamed line by line (also when compressed, e.g.
+    .jsonl.gz); JSON arrays and Excel workbooks are parsed whole.
+    """
+    if strip_compression(path).endswith('.jsonl'):
+        with open_text(path) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+    if is_excel_file(path):
+        yield from load_records(path)
+        return
+    with open_text(path) as f:
+        yield from records_from_json(json.load(f), container_key)
+
+
+def join_groups(left, right, left_keys, right_keys, build='right'):
+    """Match two record iterables on composite keys.
+
+    The `build` side is loaded into a hash table and the other side is
+    streamed through it. Yields (left_record, matches) once per left record,
+    in left order; matches is the list of right records with the same key
+    (empty when there is none).
+    """
+    if build == 'right':
+        table = {}
+        for record in right:
+            if isinstance(record, dict):
+                key = record_key(record, right_keys)
+                if key is not None:
+                    table.setdefault(key, []).append(record)
+
+        for record in left:
+            if not isinstance(record, dict):
+                continue
+            key = record_key(record, left_keys)
+            yield record, table.get(key, []) if key is not None else []
+        return
+
+    # Build on the left side: remember which left rows each right row hits
+    rows = []
+    table = {}
+    for record in left:
+        if not isinstance(record, dict):
+            continue
+        key = record_key(record, left_keys)
+        if key is not None:
+            table.setdefault(key, []).append(len(rows))
+        rows.append(record)
+
+    matched = {}
+    for record in right:
+        if isinstance(record, dict):
+            key = record_key(record, right_keys)
+            for pos in table.get(key, ()) if key is not None else ():
+                matched.setdefault(pos, []).append(record)
+
+    for pos, record in enumerate(rows):
+        yield record, matched.get(pos, [])
+
+
+def merge_pair(left_record, right_record, right_prefix='match_'):
+    """Left record plus the matched right fields under right_prefix"""
+    merged = dict(left_record)
+    if right_record is not None:
+        for key, value in right_record.items():
+            merged[f"{right_prefix}{key}"] = value
+    return merged
+
+
+def hash_join(left, right, left_keys, right_keys, how='semi', build='right',
+              right_prefix='match_', unmatched=None, stats=None):
+    """Join two record iterables on composite keys (see join_groups).
+
+    Yields the output rows in left order:
+    semi  - each matched left record once, as it is
+    inner - one merged row (merge_pair) per matching right record
+    left  - like inner, plus a copy of each unmatched left record
+    anti  - each unmatched left record
+    Unmatched left records are also appended to the unmatched list when one
+    is given; stats['matched'] counts the left records with a match.
+    """
+    if how not in JOIN_MODES:
+        raise ValueError(f"Unknown join mode '{how}', use one of {', '.join(JOIN_MODES)}")
+    if stats is None:
+        stats = {}
+    stats['matched'] = 0
+    for record, matches in join_groups(left, right, left_keys, right_keys, build):
+        if not matches:
+            if unmatched is not None:
+                unmatched.append(record)
+            if how == 'left':
+                yield dict(record)
+            elif how == 'anti':
+                yield record
+            continue
+        stats['matched'] += 1
+        if how == 'semi':
+            yield record
+        elif how != 'anti':
+            for match in matches:
+                yield merge_pair(record, match, right_prefix)
+
+
+def match_users(left_path=data_user_old_path, right_path=user_terdampak_path,
+                left_keys='nama ', right_keys='name', how='semi',
+                left_container=None, right_container='user',
+                output=output_path, unmatched_output=unmatched_path, right_prefix='match_'):
+    """Match users between two files and save matched and unmatched rows.
+
+    The default semi join writes every matched left row once, as it is;
+    inner/left write one row per match with the right fields merged in.
+    """
+    left_keys = parse_key_spec(left_keys)
+    right_keys = parse_key_spec(right_keys)
+    if len(left_keys) != len(right_keys):
+        raise ValueError("Left and right key lists must have the same length")
+
+    # Build the hash table on the smaller file, stream the larger one
+    build = 'right' if os.path.getsize(right_path) <= os.path.getsize(left_path) else 'left'
+    left = iter_records(left_path, left_container)
+    right = iter_records(right_path, right_container)
+
+    unmatched, stats = [], {}
+    joined = list(hash_join(left, right, left_keys, right_keys, how, build, right_prefix, unmatched, stats))
+
+    # Simpan hasil
+    with open_text(output, 'w') as f:
+        json.dump(joined, f, ensure_ascii=False, indent=2)
+    if unmatched_output:
+        with open_text(unmatched_output, 'w') as f:
+            json.dump(unmatched, f, ensure_ascii=False, indent=2)
+
+    print(f"Selesai ({how} join, hash table pada file {build}). {len(joined)} data disimpan di {output}")
+    print(f"Baris yang cocok: {stats['matched']}, tidak cocok: {len(unmatched)}"
+          + (f" (disimpan di {unmatched_output})" if unmatched_output else ""))
+    return joined, unmatched
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match users between two JSON/Excel files on composite keys")
+    parser.add_argument('--left', default=data_user_old_path, help=f"left file (default: {data_user_old_path})")
+    parser.add_argument('--right', default=user_terdampak_path, help=f"right file (default: {user_terdampak_path})")
+    parser.add_argument('--left-keys', default='nama ', help="left key columns with optional normalizer, e.g. 'nama :upper,birth_date:date'")
+    parser.add_argument('--right-keys', default='name', help="right key columns, same order as --left-keys")
+    parser.add_argument('--left-container', default=None, help="key holding the records when the left JSON is an object")
+    parser.add_argument('--right-container', default='user', help="key holding the records when the right JSON is an object (default: user)")
+    parser.add_argument('--how', choices=JOIN_MODES, default='semi', help="semi: each matched left row once (default); inner/left: one merged row per match; anti: unmatched left rows")
+    parser.add_argument('--output', default=output_path, help=f"output file (default: {output_path})")
+    parser.add_argument('--unmatched', default=unmatched_path, help=f"file for unmatched left rows (default: {unmatched_path})")
+    parser.add_argument('--right-prefix', default='match_', help="prefix for right fields in joined rows (default: match_)")
+    args = parser.parse_args()
+
+    match_users(args.left, args.right, args.left_keys, args.right_keys, args.how,
+                args.left_container, args.right_container, args.output, args.unmatched,
+                args.right_prefix)
+
+
+if __name__ == "__main__":
+    main()
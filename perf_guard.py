@@ -0,0 +1,232 @@
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.styles import PatternFill
+
+# Per-machine baseline of rows/s and peak memory per converter
+BASELINE_FILE = 'perf_baseline.json'
+
+# Allowed regression in percent before a check fails
+DEFAULT_TOLERANCE = 20.0
+
+DEFAULT_ROWS = 20_000
+
+
+def generate_outlets(rows, seed=42):
+    """Fixed synthetic outlet dataset with the usual dirty values"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(rows):
+        records.append({
+            'name': f" Outlet {i % 5000} ",
+            'phone': f"0812{rng.randint(1000000, 9999999)}",
+            'client': rng.choice([' ACME ', 'Aqua', 'Haier', 'LXC']),
+            'outlet': f"OUT-{i % 700}",
+            'latitude': rng.choice([f"{-6 - rng.random():.6f}", 'abc', '', None]),
+            'longitude': rng.choice([f"{106 + rng.random():.6f}", 'x']),
+            'email': rng.choice([f"user{i}@mail.com", f"user{i}", None]),
+            'ptkp': rng.choice(['TK1', 'K2', 'TK/0', None]),
+            'rekening': f" {rng.randint(10 ** 9, 10 ** 10)} ",
+            'birth_date': rng.choice(['9/15/1997', '1995-01-12', '19/4/1997']),
+        })
+    return records
+
+
+def write_colored_workbook(records, excel_file, seed=42):
+    """Excel version of the dataset with fills on the first column"""
+    rng = random.Random(seed)
+    pd.DataFrame(records).to_excel(excel_file, index=False)
+    workbook = load_workbook(excel_file)
+    worksheet = workbook.active
+    fills = [PatternFill(start_color=c, end_color=c, fill_type='solid')
+             for c in ('FFFF0000', 'FF00FF00', 'FFFFFF00')]
+    for row in range(2, len(records) + 2):
+        if rng.random() < 0.6:
+            worksheet.cell(row=row, column=1).fill = rng.choice(fills)
+    workbook.save(excel_file)
+
+
+def prepare_datasets(rows):
+    """Write the fixed input files into the current directory"""
+    records = generate_outlets(rows)
+    with open('outlets.json', 'w', encoding='utf-8') as f:
+        json.dump(records, f)
+    with open('users_old.json', 'w', encoding='utf-8') as f:
+        json.dump([{'nama ': r['name'], 'client': r['client']} for r in records], f)
+    with open('users_hit.json', 'w', encoding='utf-8') as f:
+        json.dump({'user': [{'name': r['name'].upper()} for r in records[::10]]}, f)
+    write_colored_workbook(records, 'outlets.xlsx')
+
+
+def run_convert_json_to_excel():
+    from batch_json_to_excel import convert_json_to_excel
+    os.makedirs('out', exist_ok=True)
+    assert convert_json_to_excel('outlets.json', 'out')
+
+
+def run_process_data():
+    from datacleansing import process_data
+    assert process_data('outlets.json', quiet=True)
+
+
+def run_excel_to_json():
+    from exceltojson import excel_to_json
+    assert excel_to_json('outlets.xlsx', 'outlets_colored.json', quiet=True)
+
+
+def run_matching():
+    from otomasi_matching import match_users
+    if os.path.exists('matched.json'):
+        os.remove('matched.json')
+    joined, _ = match_users('users_old.json', 'users_hit.json', output='matched.json',
+                            unmatched_output='unmatched.json')
+    assert joined and os.path.exists('matched.json')
+
+
+BENCHMARKS = {
+    'convert_json_to_excel': run_convert_json_to_excel,
+    'process_data': run_process_data,
+    'excel_to_json': run_excel_to_json,
+    'matching': run_matching,
+}
+
+
+def measure(func, rows, repeat):
+    """Best-of-repeat throughput (rows/s) and tracemalloc peak (MB)"""
+    best = None
+    for _ in range(repeat):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Memory in a separate run: tracemalloc itself slows the code down
+    tracemalloc.start()
+    with redirect_stdout(io.StringIO()):
+        func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {'rows_per_s': round(rows / best, 1), 'peak_mb': round(peak / 1024 ** 2, 1)}
+
+
+def compare(name, result, baseline, tolerance):
+    """Return failure messages for one benchmark against its baseline"""
+    failures = []
+    if baseline is None:
+        return failures
+    min_rate = baseline['rows_per_s'] * (1 - tolerance / 100)
+    if result['rows_per_s'] < min_rate:
+        change = (result['rows_per_s'] / baseline['rows_per_s'] - 1) * 100
+        failures.append(f"{name}: throughput {result['rows_per_s']:.0f} rows/s vs baseline "
+                        f"{baseline['rows_per_s']:.0f} rows/s ({change:+.1f}%, allowed -{tolerance:.0f}%)")
+    max_peak = baseline.get('max_peak_mb') or baseline['peak_mb'] * (1 + tolerance / 100)
+    if result['peak_mb'] > max_peak:
+        failures.append(f"{name}: peak memory {result['peak_mb']:.1f} MB vs budget {max_peak:.1f} MB "
+                        f"(baseline {baseline['peak_mb']:.1f} MB)")
+    return failures
+
+
+def load_baselines(baseline_file=BASELINE_FILE):
+    """All stored baselines: {rows: {benchmark: result}}"""
+    if not os.path.exists(baseline_file):
+        return {}
+    with open(baseline_file, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_results(baseline_file, rows, results):
+    """Store results as the baseline for this row count.
+
+    A hand-set max_peak_mb memory budget is kept when the numbers are refreshed.
+    """
+    baselines = load_baselines(baseline_file)
+    stored = baselines.setdefault(str(rows), {})
+    for name, result in results.items():
+        result = dict(result)
+        if stored.get(name, {}).get('max_peak_mb'):
+            result['max_peak_mb'] = stored[name]['max_peak_mb']
+        stored[name] = result
+    with open(baseline_file, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2)
+
+
+def run_perf_guard(names=None, rows=DEFAULT_ROWS, repeat=3, tolerance=DEFAULT_TOLERANCE,
+                   baseline_file=BASELINE_FILE, update=False):
+    """Run the converters on generated data and check them against the baseline.
+
+    Returns True when every benchmark is within budget.
+    """
+    baseline_file = os.path.abspath(baseline_file)
+    stored = load_baselines(baseline_file).get(str(rows), {})
+
+    names = names or list(BENCHMARKS)
+    results = {}
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix='perf-') as workdir:
+        os.chdir(workdir)
+        try:
+            print(f"Generating {rows} rows...")
+            prepare_datasets(rows)
+            for name in names:
+                results[name] = measure(BENCHMARKS[name], rows, repeat)
+        finally:
+            os.chdir(cwd)
+
+    print("-" * 72)
+    print(f"{'benchmark':<24}{'rows/s':>12}{'baseline':>12}{'peak MB':>12}{'baseline':>12}")
+    failures = []
+    for name, result in results.items():
+        base = stored.get(name)
+        print(f"{name:<24}{result['rows_per_s']:>12.0f}"
+              f"{(base['rows_per_s'] if base else float('nan')):>12.0f}"
+              f"{result['peak_mb']:>12.1f}"
+              f"{(base['peak_mb'] if base else float('nan')):>12.1f}")
+        failures.extend(compare(name, result, base, tolerance))
+    print("-" * 72)
+
+    if update:
+        save_results(baseline_file, rows, results)
+        print(f"Baseline updated: {baseline_file}")
+        return True
+
+    if not stored:
+        print(f"No baseline for {rows} rows yet; run with --update to record one")
+        return True
+    if failures:
+        print("❌ Performance regression:")
+        for failure in failures:
+            print(f"  {failure}")
+        return False
+    print(f"✅ All benchmarks within {tolerance:.0f}% of the baseline")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check converter throughput and peak memory against a per-machine baseline")
+    parser.add_argument('benchmarks', nargs='*', help=f"benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help=f"generated rows (default: {DEFAULT_ROWS})")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per benchmark, best one counts (default: 3)")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help=f"allowed regression in percent (default: {DEFAULT_TOLERANCE:.0f})")
+    parser.add_argument('--baseline', default=BASELINE_FILE, help=f"baseline file (default: {BASELINE_FILE})")
+    parser.add_argument('--update', action='store_true', help="record the current numbers as the baseline")
+    args = parser.parse_args()
+    unknown = [name for name in args.benchmarks if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    ok = run_perf_guard(args.benchmarks, args.rows, args.repeat, args.tolerance, args.baseline, args.update)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import argparse
+from record_io import load_records, write_records, is_excel_file
+from datacleansing import clean_records, iter_deduplicated
+from otomasi_matching import iter_records, parse_key_spec, hash_join, JOIN_MODES
+from cleaner_cache import print_cleaner_cache_stats
+from spill import exceeds_memory_limit, write_excel_streaming, write_json_streaming
+
+
+def run_pipeline(input_file, output_file, clean=True, dedupe_keys=None, dedupe_keep='first',
+                 match_file=None, left_keys='name', right_keys='name', how='inner',
+                 input_container=None, match_container=None, right_prefix='match_',
+                 profile=None, memory_limit=None):
+    """Load -> clean -> dedupe -> match -> write in one process.
+
+    Records stay in memory between stages; only output_file (.json or .xlsx)
+    is written, so there is no intermediate XLSX round trip.
+    """
+    try:
+        if not os.path.exists(input_file):
+            print(f"Error: Input file '{input_file}' not found.")
+            return False
+
+        # Load
+        print(f"Loading {input_file}...")
+        records = load_records(input_file, input_container)
+        print(f"Loaded {len(records)} records")
+
+        # Clean
+        if clean:
+            for warning in clean_records(records):
+                print(warning)
+            print_cleaner_cache_stats()
+
+        # Dedupe
+        if dedupe_keys:
+            stats = {}
+            records = list(iter_deduplicated(records, dedupe_keys, dedupe_keep, stats))
+            print(f"Duplicates removed ({', '.join(dedupe_keys)}, keep {dedupe_keep}): {stats['dropped']}")
+
+        # Match
+        if match_file:
+            left_spec = parse_key_spec(left_keys)
+            right_spec = parse_key_spec(right_keys)
+            if len(left_spec) != len(right_spec):
+                raise ValueError("Left and right key lists must have the same length")
+            unmatched = []
+            records = list(hash_join(records, iter_records(match_file, match_container), left_spec, right_spec,
+                                     how, 'right', right_prefix, unmatched))
+            print(f"Matched against {match_file} ({how} join): {len(records)} rows, {len(unmatched)} unmatched input rows")
+
+        # Write the final artifact only
+        if exceeds_memory_limit(input_file, memory_limit):
+            if is_excel_file(output_file):
+                write_excel_streaming(records, output_file, 'Data', profile)
+            else:
+                write_json_streaming(records, output_file)
+        else:
+            write_records(records, output_file, 'Data', profile)
+        print(f"✅ Pipeline finished: {len(records)} records saved to '{output_file}'")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error: {str(e)}")
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean, dedupe and match a dataset in one process")
+    parser.add_argument('input', help="input JSON or Excel file")
+    parser.add_argument('output', help="final .json or .xlsx file")
+    parser.add_argument('--no-clean', action='store_true', help="skip the datacleansing rules")
+    parser.add_argument('--input-container', help="key holding the records when the input JSON is an object")
+    parser.add_argument('--dedupe-keys', help="comma separated key columns for duplicate removal")
+    parser.add_argument('--keep', choices=['first', 'last'], default='first', help="which duplicate to keep")
+    parser.add_argument('--match', help="file to match the records against")
+    parser.add_argument('--match-container', help="key holding the records when the match JSON is an object")
+    parser.add_argument('--left-keys', default='name', help="input key columns, e.g. 'name,birth_date:date'")
+    parser.add_argument('--right-keys', default='name', help="match file key columns, same order")
+    parser.add_argument('--how', choices=JOIN_MODES, default='inner', help="join mode (default: inner)")
+    parser.add_argument('--right-prefix', default='match_', help="prefix for matched fields (default: match_)")
+    parser.add_argument('--profile', help="styling profile for Excel output")
+    parser.add_argument('--memory-limit', help="e.g. 2G; stream the output when the estimated working set is larger")
+    args = parser.parse_args()
+
+    dedupe_keys = [k.strip() for k in args.dedupe_keys.split(',') if k.strip()] if args.dedupe_keys else None
+    run_pipeline(args.input, args.output, not args.no_clean, dedupe_keys, args.keep,
+                 args.match, args.left_keys, args.right_keys, args.how,
+                 args.input_container, args.match_container, args.right_prefix,
+                 args.profile, args.memory_limit)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import sys
+import time
+
+
+def format_duration(seconds):
+    """Format seconds as H:MM:SS"""
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+class ProgressReporter:
+    """Throttled progress line with throughput, elapsed time and ETA.
+
+    update() is only a counter increment and comparison until the next
+    check point, so it can be called once per record. On a terminal the
+    line is redrawn in place; otherwise (cron, logs) a plain line is
+    printed every log_interval seconds. quiet=True disables all output.
+    """
+    def __init__(self, total, label='Processing', unit='rows', quiet=False,
+                 interval=0.5, log_interval=10.0, stream=None):
+        self.total = total
+        self.label = label
+        self.unit = unit
+        self.quiet = quiet
+        self.stream = stream or sys.stderr
+        self.interactive = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self.interval = interval if self.interactive else log_interval
+        self.count = 0
+        self.start = time.perf_counter()
+        self._last_report = self.start
+        self._next_check = 1
+        self._stride = max(1, (total or 0) // 1000)
+        self._line_length = 0
+
+    def update(self, n=1):
+        self.count += n
+        if self.count >= self._next_check and not self.quiet:
+            self._next_check = self.count + self._stride
+            now = time.perf_counter()
+            if now - self._last_report >= self.interval:
+                self._last_report = now
+                self._write(self._status(now))
+
+    def _status(self, now):
+        elapsed = now - self.start
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        text = f"{self.label}: {self.count:,}"
+        if self.total:
+            text += f"/{self.total:,} {self.unit} ({self.count / self.total:.1%})"
+        else:
+            text += f" {self.unit}"
+        text += f" | {rate:,.0f} {self.unit}/s | elapsed {format_duration(elapsed)}"
+        if self.total and rate > 0 and self.count < self.total:
+            text += f" | ETA {format_duration((self.total - self.count) / rate)}"
+        return text
+
+    def _write(self, text):
+        if self.interactive:
+            padding = ' ' * max(0, self._line_length - len(text))
+            self.stream.write('\r' + text + padding)
+            self._line_length = len(text)
+        else:
+            self.stream.write(text + '\n')
+        self.stream.flush()
+
+    def clear(self):
+        """Erase the in-place line so other output starts on a clean line"""
+        if self.interactive and self._line_length and not self.quiet:
+            self.stream.write('\r' + ' ' * self._line_length + '\r')
+            self.stream.flush()
+            self._line_length = 0
+
+    def finish(self):
+        """Print the final throughput line"""
+        if self.quiet:
+            return
+        self.clear()
+        self._write(self._status(time.perf_counter()))
+        if self.interactive:
+            self.stream.write('\n')
+            self._line_length = 0
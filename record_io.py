@@ -0,0 +1,106 @@
+import json
+import gzip
+import bz2
+import lzma
+import pandas as pd
+from pathlib import Path
+
+# Optional dependency: zstandard (pip install zstandard) is only needed for
+# .zst files; gzip, bz2 and xz come with Python
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm', '.xls')
+COMPRESSION_EXTENSIONS = ('.gz', '.bz2', '.xz', '.zst')
+
+
+def compression_of(path):
+    """Compression extension of a path ('.gz', '.bz2', '.xz', '.zst') or None"""
+    suffix = Path(str(path)).suffix.lower()
+    return suffix if suffix in COMPRESSION_EXTENSIONS else None
+
+
+def strip_compression(path):
+    """Path without its compression extension: 'data.json.gz' -> 'data.json'"""
+    path = str(path)
+    return path[:-len(compression_of(path))] if compression_of(path) else path
+
+
+def open_text(path, mode='r'):
+    """Open a text file, transparently (de)compressing by extension.
+
+    Compressed files are streamed through the codec; nothing is
+    decompressed to a temporary file.
+    """
+    compression = compression_of(path)
+    if compression is None:
+        return open(path, mode, encoding='utf-8')
+    if compression == '.gz':
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if compression == '.bz2':
+        return bz2.open(path, mode + 't', encoding='utf-8')
+    if compression == '.xz':
+        return lzma.open(path, mode + 't', encoding='utf-8')
+    if zstandard is None:
+        # Optional dependency, not installed: say how to get it
+        raise ImportError(f"Reading or writing '{path}' needs the zstandard package (pip install zstandard)")
+    return zstandard.open(path, mode + 't', encoding='utf-8')
+
+
+def is_excel_file(path):
+    """True if the path looks like an Excel workbook"""
+    return str(path).lower().endswith(EXCEL_EXTENSIONS)
+
+
+def records_from_json(data, key=None):
+    """Return the record list of loaded JSON data.
+
+    A list is used directly; for a dict the value of `key` is used, or the
+    first key's value like the JSON -> Excel converters do.
+    """
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        if key is None:
+            key = list(data.keys())[0]
+        return data[key]
+    raise ValueError("JSON data must be either a list or a dictionary")
+
+
+def load_records(path, key=None, clean=False):
+    """Load records from a JSON or Excel file.
+
+    Excel files go through exceltojson.read_excel_records (excel_to_json
+    semantics). With clean=True, JSON records are cleaned with
+    datacleansing.clean_record (process_data semantics).
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(f"File '{path}' not found")
+
+    if is_excel_file(path):
+        from exceltojson import read_excel_records
+        return read_excel_records(path)
+
+    with open_text(path) as file:
+        records = records_from_json(json.load(file), key)
+
+    if clean:
+        from datacleansing import clean_record
+        for i, record in enumerate(records):
+            if isinstance(record, dict):
+                clean_record(record, i + 1)
+    return records
+
+
+def write_records(records, path, sheet_name='Data', profile=None):
+    """Write records to JSON, or to a styled Excel sheet for Excel paths"""
+    if is_excel_file(path):
+        from excel_styles import write_styled_excel
+        write_styled_excel(pd.DataFrame(records), path, sheet_name, profile)
+        return
+
+    from exceltojson import CustomJSONEncoder
+    with open_text(path, 'w') as file:
+        json.dump(records, file, indent=2, ensure_ascii=False, cls=CustomJSONEncoder)
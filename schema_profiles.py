@@ -0,0 +1,182 @@
+import os
+import json
+import hashlib
+from datetime import datetime
+from checkpoint import atomic_write_json
+
+# Profiles are cached here, one JSON file per template
+SCHEMA_CACHE_DIR = '.schema_cache'
+
+# Rows sampled when a new template is profiled
+PROFILE_SAMPLE_ROWS = 1000
+
+# Date formats in the order format_birth_date tries them
+DATE_FORMATS = [
+    '%m/%d/%Y',    # 9/15/1997, 12/19/1997
+    '%m/%d/%y',    # 9/15/97, 12/19/97
+    '%Y-%m-%d',    # 1995-01-12, 1998-04-08
+    '%d/%m/%Y',    # 19/4/1997
+    '%d/%m/%y',    # 19/4/97
+    '%Y/%m/%d',    # 1997/9/15
+    '%m-%d-%Y',    # 9-15-1997
+    '%d-%m-%Y',    # 15-9-1997
+]
+
+class SchemaDriftError(ValueError):
+    """Input no longer matches the cached profile of its template"""
+
+
+def header_fingerprint(columns, container_key=None):
+    """Stable id of a header: column names in order plus the JSON container key"""
+    text = json.dumps([container_key, [str(c) for c in columns]], ensure_ascii=False)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def json_header(records):
+    """Column names of a JSON record list, taken from its first object"""
+    for record in records:
+        if isinstance(record, dict):
+            return list(record.keys())
+    return []
+
+
+def infer_date_format(values):
+    """First of DATE_FORMATS that parses every sampled text value, else None.
+
+    Checking the whole sample settles ambiguous dates: 9/10/1997 is read
+    day-first in a column that also holds 19/4/1997.
+    """
+    texts = []
+    for value in values:
+        if value is None or (isinstance(value, float) and value != value):
+            continue
+        if not isinstance(value, str):
+            return None
+        if value.strip():
+            texts.append(value.strip())
+    if not texts:
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            for text in texts:
+                datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+        return fmt
+    return None
+
+
+def build_profile(columns, records, name=None, container_key=None, styling=None):
+    """Profile a template from its header and a sample of its records.
+
+    Only what the converters read back is kept: the header (for drift
+    checks), the JSON container key, the text date format per column and
+    the output styling profile.
+    """
+    columns = [str(c) for c in columns]
+    sample = [r for r in records[:PROFILE_SAMPLE_ROWS] if isinstance(r, dict)]
+    date_formats = {}
+    for column in columns:
+        fmt = infer_date_format([r.get(column) for r in sample])
+        if fmt:
+            date_formats[column] = fmt
+    return {
+        'name': name,
+        'fingerprint': header_fingerprint(columns, container_key),
+        'container_key': container_key,
+        'columns': columns,
+        'date_formats': date_formats,
+        'styling': styling,
+        'created': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def describe_drift(profile, columns, container_key=None):
+    """Human readable difference between a profile and the current header"""
+    columns = [str(c) for c in columns]
+    problems = []
+    if profile.get('container_key') != container_key:
+        where = lambda key: f"under '{key}'" if key is not None else "in a top-level list"
+        problems.append(f"records {where(container_key)} instead of {where(profile.get('container_key'))}")
+    missing = [c for c in profile['columns'] if c not in columns]
+    added = [c for c in columns if c not in profile['columns']]
+    if missing:
+        problems.append(f"missing columns: {', '.join(missing)}")
+    if added:
+        problems.append(f"new columns: {', '.join(added)}")
+    if not problems and columns != profile['columns']:
+        problems.append("column order changed")
+    return '; '.join(problems) or "header changed"
+
+
+class SchemaCache:
+    """Profiles on disk: '<name>.json' for named templates, '<fingerprint>.json' otherwise"""
+    def __init__(self, cache_dir=SCHEMA_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def load(self, key):
+        try:
+            with open(self.path(key), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, profile):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        atomic_write_json(self.path(profile['name'] or profile['fingerprint']), profile)
+
+
+def resolve_schema(columns, records, schema='auto', container_key=None, styling=None,
+                   cache_dir=SCHEMA_CACHE_DIR):
+    """Return (profile, cached) for an input header.
+
+    schema='auto' looks the profile up by header fingerprint, so every new
+    header simply gets its own profile and drift is never reported. Any
+    other value names a template: its first run is profiled and cached,
+    later runs must have the same header or SchemaDriftError is raised.
+    """
+    cache = SchemaCache(cache_dir)
+    fingerprint = header_fingerprint(columns, container_key)
+    named = schema != 'auto'
+    profile = cache.load(schema if named else fingerprint)
+    if profile is not None:
+        if profile['fingerprint'] != fingerprint:
+            raise SchemaDriftError(f"Input does not match schema '{schema}': "
+                                   f"{describe_drift(profile, columns, container_key)}. "
+                                   f"Delete {cache.path(schema)} to re-profile the template.")
+        return profile, True
+
+    profile = build_profile(columns, records, schema if named else None, container_key, styling)
+    cache.save(profile)
+    return profile, False
+
+
+def resolve_json_schema(data, schema='auto', styling=None, cache_dir=SCHEMA_CACHE_DIR):
+    """Pick the records of loaded JSON data and resolve their profile.
+
+    Returns (records, profile, cached). For a dict, a known template reads
+    its recorded container key instead of guessing the first key.
+    """
+    container_key = None
+    if isinstance(data, list):
+        records = data
+    elif isinstance(data, dict):
+        known = SchemaCache(cache_dir).load(schema) if schema != 'auto' else None
+        if known is not None and known['container_key'] in data:
+            container_key = known['container_key']
+        else:
+            container_key = list(data.keys())[0]
+        records = data[container_key]
+    else:
+        raise ValueError("JSON data must be either a list or a dictionary")
+    profile, cached = resolve_schema(json_header(records), records, schema, container_key, styling, cache_dir)
+    return records, profile, cached
+
+
+def schema_label(profile, cached):
+    """One-line status for the converters' output"""
+    name = profile['name'] or profile['fingerprint']
+    return f"📋 Schema {name}: {'cached profile' if cached else 'new profile saved'}"
@@ -0,0 +1,184 @@
+import json
+import os
+import re
+import sqlite3
+import tempfile
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from excel_styles import get_style_profile, register_named_styles, styled_cell
+from record_io import open_text, compression_of, strip_compression
+
+# Rough in-memory size of a dataset relative to its file size: Python dicts,
+# DataFrame and openpyxl cell objects for JSON; xlsx is zip-compressed XML
+WORKING_SET_FACTORS = {
+    '.json': 12,
+    '.xlsx': 60,
+    '.xlsm': 60,
+    '.xls': 20,
+}
+
+# Typical compression ratio of JSON exports, used to estimate the unpacked size
+COMPRESSION_RATIO = 8
+
+# Records kept in memory per spool chunk before it is flushed to SQLite
+SPOOL_CHUNK_ROWS = 10_000
+
+_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def parse_memory_limit(value):
+    """Parse '512M', '2G', '1.5g' or a plain byte count into bytes"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?\s*', str(value).upper())
+    if not match:
+        raise ValueError(f"Invalid memory limit '{value}', use e.g. 512M or 2G")
+    return int(float(match.group(1)) * _UNITS[match.group(2)])
+
+
+def estimate_working_set(path):
+    """Estimate the peak memory (bytes) of converting a file in memory"""
+    ext = os.path.splitext(strip_compression(path).lower())[1]
+    size = os.path.getsize(path)
+    if compression_of(path):
+        size *= COMPRESSION_RATIO
+    return size * WORKING_SET_FACTORS.get(ext, 12)
+
+
+def exceeds_memory_limit(path, memory_limit):
+    """True if a memory limit is set and the file's estimated working set is above it"""
+    limit = parse_memory_limit(memory_limit)
+    return limit is not None and estimate_working_set(path) > limit
+
+
+def _default(obj):
+    from exceltojson import CustomJSONEncoder
+    return CustomJSONEncoder().default(obj)
+
+
+class RecordSpool:
+    """Append-only record store that keeps one chunk in memory and spills the
+    rest to a temporary SQLite file. Iteration returns records in insertion
+    order; it also tracks the column order and text widths for writers.
+    """
+    def __init__(self, chunk_rows=SPOOL_CHUNK_ROWS):
+        self.chunk_rows = chunk_rows
+        self.columns = {}  # column -> longest text length
+        self._buffer = []
+        self._count = 0
+        fd, self._path = tempfile.mkstemp(prefix='spool-', suffix='.sqlite')
+        os.close(fd)
+        self._db = sqlite3.connect(self._path)
+        self._db.execute('PRAGMA journal_mode = OFF')
+        self._db.execute('PRAGMA synchronous = OFF')
+        self._db.execute('CREATE TABLE rows (id INTEGER PRIMARY KEY, data TEXT)')
+
+    def __len__(self):
+        return self._count
+
+    def append(self, record):
+        if isinstance(record, dict):
+            for key, value in record.items():
+                length = len(str(value))
+                if length > self.columns.get(key, -1):
+                    self.columns[key] = length
+        self._buffer.append(record)
+        self._count += 1
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def flush(self):
+        if self._buffer:
+            start = self._count - len(self._buffer)
+            self._db.executemany('INSERT INTO rows VALUES (?, ?)',
+                                 ((start + i, json.dumps(r, ensure_ascii=False, default=_default))
+                                  for i, r in enumerate(self._buffer)))
+            self._buffer = []
+
+    def __iter__(self):
+        self.flush()
+        cursor = self._db.execute('SELECT data FROM rows ORDER BY id')
+        while True:
+            rows = cursor.fetchmany(self.chunk_rows)
+            if not rows:
+                break
+            for (data,) in rows:
+                yield json.loads(data)
+
+    def __getitem__(self, pos):
+        self.flush()
+        row = self._db.execute('SELECT data FROM rows WHERE id = ?', (pos,)).fetchone()
+        if row is None:
+            raise IndexError(pos)
+        return json.loads(row[0])
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            os.remove(self._path)
+            self._db = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def scan_columns(records):
+    """Column order (first appearance, like pd.DataFrame) and longest text per column"""
+    columns = {}
+    for record in records:
+        if isinstance(record, dict):
+            for key, value in record.items():
+                length = len(str(value))
+                if length > columns.get(key, -1):
+                    columns[key] = length
+    return columns
+
+
+def write_excel_streaming(records, excel_file, sheet_name='Data', profile=None, columns=None):
+    """Write records row by row with a write-only workbook and a styling profile.
+
+    columns maps column -> longest text length (RecordSpool.columns or
+    scan_columns); nothing but the current row is kept in memory.
+    """
+    if columns is None:
+        columns = records.columns if isinstance(records, RecordSpool) else scan_columns(records)
+    settings = get_style_profile(profile)
+
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+    header_name, body_name = register_named_styles(workbook, profile)
+
+    names = list(columns)
+    for col_idx, name in enumerate(names, start=1):
+        width = max(len(str(name)), columns[name])
+        worksheet.column_dimensions[get_column_letter(col_idx)].width = min(width + 2, settings['max_width'])
+    if settings['freeze_panes']:
+        worksheet.freeze_panes = settings['freeze_panes']
+
+    worksheet.append([styled_cell(worksheet, name, header_name) for name in names])
+    for record in records:
+        worksheet.append([styled_cell(worksheet, record.get(name), body_name) for name in names])
+
+    workbook.save(excel_file)
+
+
+def write_json_streaming(records, json_file):
+    """Write records one at a time; same bytes as json.dump(records, indent=2)"""
+    from exceltojson import CustomJSONEncoder
+    with open_text(json_file, 'w') as f:
+        first = True
+        for record in records:
+            f.write('[\n  ' if first else ',\n  ')
+            text = json.dumps(record, indent=2, ensure_ascii=False, cls=CustomJSONEncoder)
+            f.write(text.replace('\n', '\n  '))
+            first = False
+        f.write('[]' if first else '\n]')
@@ -0,0 +1,46 @@
+import json
+from concurrent.futures import ProcessPoolExecutor
+from checkpoint import Checkpoint, atomic_write_json
+
+
+def test_atomic_write_leaves_no_temp_file(tmp_path):
+    path = tmp_path / 'state.json'
+    atomic_write_json(path, {'a': 'é'})
+    assert json.loads(path.read_text(encoding='utf-8')) == {'a': 'é'}
+    assert [p.name for p in tmp_path.iterdir()] == ['state.json']
+
+
+def test_concurrent_writers_of_one_path_do_not_clash(tmp_path):
+    path = str(tmp_path / 'profile.json')
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        list(executor.map(atomic_write_json, [path] * 40, [{'n': i} for i in range(40)]))
+    assert json.loads((tmp_path / 'profile.json').read_text(encoding='utf-8'))['n'] in range(40)
+    assert [p.name for p in tmp_path.iterdir()] == ['profile.json']
+
+
+def test_state_is_reused_only_for_the_same_signature(tmp_path):
+    state_dir = tmp_path / 'run.checkpoint'
+    state = Checkpoint(str(state_dir), {'input': 'a.json', 'chunk_size': 10})
+    state.save_chunk('0', {'records': [{'n': 1}], 'warnings': []})
+    state.mark_done('file.json', [1, 2])
+
+    resumed = Checkpoint(str(state_dir), {'input': 'a.json', 'chunk_size': 10})
+    assert len(resumed) == 2
+    assert resumed.is_done('0')
+    assert resumed.load_chunk('0') == {'records': [{'n': 1}], 'warnings': []}
+    assert resumed.is_done('file.json', [1, 2])
+    assert not resumed.is_done('file.json', [1, 3])
+    assert not resumed.is_done('10')
+
+    changed = Checkpoint(str(state_dir), {'input': 'a.json', 'chunk_size': 20})
+    assert len(changed) == 0
+    assert list(state_dir.iterdir()) == []
+
+
+def test_clear_removes_the_state(tmp_path):
+    state_dir = tmp_path / 'run.checkpoint'
+    state = Checkpoint(str(state_dir), 'sig')
+    state.mark_done('0')
+    state.clear()
+    assert not state_dir.exists()
+    assert len(Checkpoint(str(state_dir), 'sig')) == 0
@@ -0,0 +1,182 @@
+import io
+import json
+import os
+import random
+from contextlib import redirect_stdout
+import pandas as pd
+import pytest
+from checkpoint import Checkpoint, file_fingerprint
+from datacleansing import (DEDUPE_MEMORY_KEYS, _clean_chunk, changed_fields, clean_record, clean_records, dedupe_records,
+                           find_coordinate_clusters, haversine_m, iter_deduplicated, process_data)
+
+
+def test_clusters_only_use_fully_valid_coordinates():
+    records = [
+        {'latitude': '-6.200000', 'longitude': '106.800000'},
+        {'latitude': '-6.200100', 'longitude': '106.800100'},  # ~16 m from the first
+        {'latitude': '0.0', 'longitude': '106.800000'},
+        {'latitude': '0.0', 'longitude': '106.800001'},
+        {'latitude': '-6.300000', 'longitude': '0.0'},
+        {'latitude': '0.0', 'longitude': '0.0'},
+        {'latitude': '-7.000000', 'longitude': '110.000000'},
+    ]
+    clusters, missing = find_coordinate_clusters(records, radius_m=100)
+    assert clusters == [[0, 1]]
+    assert missing == [2, 3, 4, 5]
+
+
+def test_cleaned_invalid_coordinates_never_cluster():
+    records = [{'latitude': 'abc', 'longitude': f"{106 + i / 1e6:.6f}"} for i in range(5)]
+    for number, record in enumerate(records, start=1):
+        clean_record(record, number)
+    clusters, missing = find_coordinate_clusters(records, radius_m=100)
+    assert clusters == []
+    assert missing == [0, 1, 2, 3, 4]
+
+
+
+def test_points_just_inside_the_radius_are_clustered():
+    records = [{'latitude': '-5.998334', 'longitude': '106.006638'},
+               {'latitude': '-5.998254', 'longitude': '106.007080'}]
+    assert 49 < haversine_m(-5.998334, 106.006638, -5.998254, 106.007080) < 50
+    assert find_coordinate_clusters(records, radius_m=50) == ([[0, 1]], [])
+    assert find_coordinate_clusters(records, radius_m=49) == ([], [])
+
+
+@pytest.mark.parametrize('lat', [-6.0, 60.0])
+def test_clusters_match_a_brute_force_pair_search(lat):
+    rng = random.Random(7)
+    coords = [(lat + rng.uniform(-0.01, 0.01), 106 + rng.uniform(-0.01, 0.01)) for _ in range(300)]
+    records = [{'latitude': f"{a:.6f}", 'longitude': f"{b:.6f}"} for a, b in coords]
+    coords = [(float(r['latitude']), float(r['longitude'])) for r in records]
+
+    parent = list(range(len(coords)))
+    def find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+    for i in range(len(coords)):
+        for j in range(i):
+            if haversine_m(*coords[i], *coords[j]) <= 100:
+                parent[find(j)] = find(i)
+    groups = {}
+    for i in range(len(coords)):
+        groups.setdefault(find(i), []).append(i)
+    expected = sorted(g for g in groups.values() if len(g) > 1)
+
+    clusters, _ = find_coordinate_clusters(records, radius_m=100)
+    assert clusters == expected
+
+def test_cluster_radius_must_be_positive():
+    with pytest.raises(ValueError):
+        find_coordinate_clusters([], radius_m=0)
+
+
+def test_haversine_one_degree_of_latitude():
+    assert haversine_m(0, 0, 1, 0) == pytest.approx(111_195, rel=1e-3)
+
+
+DUPLICATED = [
+    {'name': 'Toko A', 'phone': '0812', 'n': 1},
+    {'name': ' toko a ', 'phone': '0812', 'n': 2},
+    {'name': 'Toko B', 'phone': '0813', 'n': 3},
+    {'name': None, 'phone': None, 'n': 4},
+    {'name': None, 'phone': None, 'n': 5},
+    {'name': 'TOKO A', 'phone': '0812', 'n': 6},
+]
+
+
+@pytest.mark.parametrize('max_memory_keys', [DEDUPE_MEMORY_KEYS, 1])
+def test_dedupe_keeps_first_or_last_of_each_key(max_memory_keys):
+    first, dropped = dedupe_records(DUPLICATED, ['name', 'phone'], 'first', max_memory_keys)
+    assert [r['n'] for r in first] == [1, 3, 4, 5]
+    assert dropped == 2
+    last, dropped = dedupe_records(DUPLICATED, ['name', 'phone'], 'last', max_memory_keys)
+    assert [r['n'] for r in last] == [3, 4, 5, 6]
+    assert dropped == 2
+
+
+def test_dedupe_streams_keep_first():
+    stats = {}
+    unique = iter_deduplicated(iter(DUPLICATED), ['name', 'phone'], stats=stats)
+    assert [r['n'] for r in unique] == [1, 3, 4, 5]
+    assert stats['dropped'] == 2
+
+
+def test_dedupe_rejects_unknown_keep():
+    with pytest.raises(ValueError):
+        dedupe_records(DUPLICATED, ['name'], 'middle')
+
+
+def outlets(count):
+    return [{'name': f" Toko {i} ", 'phone': f"0812{i:04d}", 'email': f"TOKO{i}@Mail.com ",
+             'latitude': f"-6.{i:06d}", 'longitude': 'abc' if i % 7 == 0 else f"106.{i:06d}"}
+            for i in range(count)]
+
+
+def run_process_data(tmp_path, monkeypatch, name, records, **options):
+    monkeypatch.chdir(tmp_path)
+    with open(name, 'w', encoding='utf-8') as f:
+        json.dump(records, f)
+    assert process_data(name, quiet=True, **options)
+    return pd.read_excel(f"cleaned-{name[:-len('.json')]}.xlsx")
+
+
+def test_checkpoint_resume_gives_the_same_output(tmp_path, monkeypatch, capsys):
+    records = outlets(25)
+    expected = run_process_data(tmp_path, monkeypatch, 'outlets.json', records, chunk_size=10)
+
+    # Interrupted run: the first chunk was committed, the rest was not
+    state = Checkpoint('cleaned-outlets.xlsx.checkpoint',
+                       {'input': os.path.abspath('outlets.json'),
+                        'fingerprint': file_fingerprint('outlets.json'), 'chunk_size': 10})
+    chunk = [dict(r) for r in records[:10]]
+    warnings = clean_records(chunk)
+    state.save_chunk('0', {'records': chunk, 'warnings': warnings})
+    capsys.readouterr()
+
+    with redirect_stdout(io.StringIO()) as output:
+        assert process_data('outlets.json', checkpoint=True, chunk_size=10, quiet=True)
+    assert 'Resuming from checkpoint: 1 chunks already cleaned' in output.getvalue()
+    pd.testing.assert_frame_equal(pd.read_excel('cleaned-outlets.xlsx'), expected)
+    assert not os.path.exists('cleaned-outlets.xlsx.checkpoint')
+
+
+def test_spilled_run_gives_the_same_output(tmp_path, monkeypatch):
+    records = outlets(25)
+    options = {'chunk_size': 10, 'dedupe_keys': ['phone']}
+    expected = run_process_data(tmp_path, monkeypatch, 'outlets.json', records, **options)
+    spilled = run_process_data(tmp_path, monkeypatch, 'outlets.json', records, memory_limit=1, **options)
+    pd.testing.assert_frame_equal(spilled, expected)
+
+
+@pytest.mark.parametrize('options', [{}, {'memory_limit': 1}])
+def test_parallel_cleaning_matches_serial(tmp_path, monkeypatch, options):
+    records = outlets(25) + [{'ptkp': 'k/1', 'kk': 123}]
+    expected = run_process_data(tmp_path, monkeypatch, 'outlets.json', records, chunk_size=10, **options)
+    parallel = run_process_data(tmp_path, monkeypatch, 'outlets.json', records, chunk_size=10, workers=2, **options)
+    pd.testing.assert_frame_equal(parallel, expected)
+
+
+def test_clean_chunk_needs_only_its_slice_and_returns_changes():
+    records = [{'name': ' Toko ', 'phone': '0812'}, {'name': 'Toko', 'phone': '0813'}, 'x']
+    changes, warnings, _ = _clean_chunk((records, 20))
+    assert changes == [(0, {'name': 'Toko'})]
+    assert warnings == ['Warning: Record 23 is not a valid object, skipping...']
+
+
+def test_changed_fields_reports_value_and_type_changes():
+    original = {'name': ' Toko ', 'phone': '0812', 'kk': 123, 'n': 1}
+    cleaned = {'name': 'Toko', 'phone': '0812', 'kk': '123', 'n': 1}
+    assert changed_fields(original, cleaned) == {'name': 'Toko', 'kk': '123'}
+
+
+def test_process_data_reports_failure(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert process_data('missing.json', quiet=True) is False
+    with open('broken.json', 'w', encoding='utf-8') as f:
+        f.write('[{')
+    assert process_data('broken.json', quiet=True) is False
+    with open('object.json', 'w', encoding='utf-8') as f:
+        json.dump({'a': 1}, f)
+    assert process_data('object.json', quiet=True) is False
@@ -0,0 +1,57 @@
+import json
+from delta_export import compute_delta, delta_export
+
+
+def test_simple_added_removed_changed():
+    previous = [{'id': 1, 'v': 'a'}, {'id': 2, 'v': 'b'}, {'id': 3, 'v': 'c'}]
+    current = [{'id': 1, 'v': 'a'}, {'id': 2, 'v': 'B'}, {'id': 4, 'v': 'd'}]
+    delta = compute_delta(previous, current, ['id'])
+    assert delta['added'] == [{'id': 4, 'v': 'd'}]
+    assert delta['removed'] == [{'id': 3, 'v': 'c'}]
+    assert [(c['before'], c['after'], c['fields']) for c in delta['changed']] == \
+        [({'id': 2, 'v': 'b'}, {'id': 2, 'v': 'B'}, ['v'])]
+    assert delta['unchanged'] == 1
+
+
+def test_duplicate_previous_key_is_not_lost():
+    previous = [{'id': 1, 'v': 'a'}, {'id': 1, 'v': 'b'}]
+    current = [{'id': 1, 'v': 'b'}]
+    delta = compute_delta(previous, current, ['id'])
+    assert delta['unchanged'] == 1
+    assert delta['removed'] == [{'id': 1, 'v': 'a'}]
+    assert delta['added'] == [] and delta['changed'] == []
+    assert delta['duplicate_keys'] == 1
+
+
+def test_duplicate_current_keys_pair_identical_rows_first():
+    previous = [{'id': 1, 'v': 'a'}, {'id': 1, 'v': 'b'}]
+    current = [{'id': 1, 'v': 'x'}, {'id': 1, 'v': 'a'}, {'id': 1, 'v': 'y'}]
+    delta = compute_delta(previous, current, ['id'])
+    assert delta['unchanged'] == 1
+    assert [(c['before']['v'], c['after']['v']) for c in delta['changed']] == [('b', 'x')]
+    assert delta['added'] == [{'id': 1, 'v': 'y'}]
+    assert delta['removed'] == []
+
+
+def test_records_without_key_only_match_identical_rows():
+    previous = [{'id': None, 'v': 'a'}, {'id': '', 'v': 'b'}]
+    current = [{'id': None, 'v': 'a'}, {'v': 'c'}]
+    delta = compute_delta(previous, current, ['id'])
+    assert delta['unchanged'] == 1
+    assert delta['removed'] == [{'id': '', 'v': 'b'}]
+    assert delta['added'] == [{'v': 'c'}]
+    assert delta['missing_keys'] == 4
+
+
+def test_delta_export_writes_json(tmp_path):
+    previous_file = tmp_path / 'prev.json'
+    current_file = tmp_path / 'cur.json'
+    previous_file.write_text(json.dumps([{'id': 1, 'v': 'a'}]), encoding='utf-8')
+    current_file.write_text(json.dumps([{'id': 1, 'v': 'b'}, {'id': 2, 'v': 'c'}]), encoding='utf-8')
+    output_file = tmp_path / 'delta.json'
+
+    delta_export(str(previous_file), str(current_file), ['id'], str(output_file))
+
+    payload = json.loads(output_file.read_text(encoding='utf-8'))
+    assert payload['added'] == [{'id': 2, 'v': 'c'}]
+    assert payload['changed'][0]['fields'] == ['v']
@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+from excel_styles import write_styled_excel
+
+
+def test_styled_excel_keeps_values_and_applies_profile(tmp_path):
+    df = pd.DataFrame([{'name': 'Ali', 'when': pd.Timestamp('2024-01-02'), 'n': 1},
+                       {'name': 'Budi', 'when': pd.NaT, 'n': float('nan')}])
+    excel_file = tmp_path / 'out.xlsx'
+    write_styled_excel(df, excel_file, 'Data', 'default')
+
+    worksheet = load_workbook(excel_file)['Data']
+    assert [c.value for c in worksheet[1]] == ['name', 'when', 'n']
+    assert worksheet['A1'].fill.fgColor.rgb == 'FF10B4B1'
+    assert worksheet['A1'].font.b
+    assert worksheet['A2'].alignment.wrap_text
+    assert worksheet['B2'].number_format == 'YYYY-MM-DD HH:MM:SS'
+    assert worksheet['B3'].value is None and worksheet['C3'].value is None
+    assert worksheet.freeze_panes == 'A2'
+    pd.testing.assert_frame_equal(pd.read_excel(excel_file), df)
+
+
+def test_unknown_profile_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match='Unknown style profile'):
+        write_styled_excel(pd.DataFrame([{'a': 1}]), tmp_path / 'out.xlsx', 'Data', 'nope')
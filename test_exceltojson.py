@@ -0,0 +1,147 @@
+import json
+import os
+import sys
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+from openpyxl.styles import PatternFill
+from exceltojson import batch_excel_to_json, excel_sheets_to_json, excel_to_json, main
+from cleaner_cache import configure_cleaner_cache
+
+
+def test_every_unparseable_date_is_reported_with_its_row(tmp_path, capsys):
+    excel_file = tmp_path / 'in.xlsx'
+    pd.DataFrame({'name': ['a', 'b', 'c'],
+                  'birth_date': ['not a date', '9/15/1997', 'not a date']}).to_excel(excel_file, index=False)
+    json_file = tmp_path / 'out.json'
+
+    assert excel_to_json(str(excel_file), str(json_file), quiet=True)
+
+    out = capsys.readouterr().out
+    assert "Could not parse date 'not a date' in row 2" in out
+    assert "Could not parse date 'not a date' in row 4" in out
+    records = json.loads(json_file.read_text(encoding='utf-8'))
+    assert [r['birth_date'] for r in records] == ['not a date', '1997-09-15', 'not a date']
+
+
+def test_streaming_path_reports_the_same_warnings(tmp_path, capsys):
+    excel_file = tmp_path / 'in.xlsx'
+    pd.DataFrame({'name': ['a', 'b'], 'birth_date': ['??', '??']}).to_excel(excel_file, index=False)
+    configure_cleaner_cache()
+
+    assert excel_to_json(str(excel_file), str(tmp_path / 'out.json'), memory_limit=1, quiet=True)
+
+    assert capsys.readouterr().out.count("Could not parse date '??'") == 2
+
+
+def write_sheets(excel_file, sheets):
+    with pd.ExcelWriter(excel_file) as writer:
+        for name, df in sheets.items():
+            df.to_excel(writer, sheet_name=name, index=False)
+
+
+def outlet_sheet(bad_row):
+    dates = ['9/15/1997'] * 3
+    dates[bad_row] = f"bad {bad_row}"
+    return pd.DataFrame({'name': ['a', 'b', 'c'], 'birth_date': dates})
+
+
+def test_sheets_in_parallel_keep_warnings_and_share_one_profile(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    write_sheets('in.xlsx', {f"S{i}": outlet_sheet(i % 3) for i in range(6)})
+
+    assert excel_sheets_to_json('in.xlsx', 'out.json', workers=3, schema='auto', quiet=True)
+
+    out = capsys.readouterr().out
+    warnings = [line for line in out.splitlines() if 'Could not parse date' in line]
+    assert warnings == [f"Warning: Could not parse date 'bad {i % 3}' in row {i % 3 + 2}, keeping original value"
+                        for i in range(6)]
+    assert out.index("bad 0' in row 2") < out.index("✓ Sheet 'S0'") < out.index("bad 1' in row 3")
+    assert out.count('📋 Schema') == 6
+    assert [f for f in os.listdir('.schema_cache') if not f.endswith('.json')] == []
+    records = json.loads((tmp_path / 'out.json').read_text(encoding='utf-8'))
+    assert [r['sheet'] for r in records] == [f"S{i}" for i in range(6) for _ in range(3)]
+
+
+def test_per_sheet_files_that_would_collide_are_rejected(tmp_path, capsys):
+    excel_file = tmp_path / 'in.xlsx'
+    write_sheets(excel_file, {'A B': outlet_sheet(0), 'A_B': outlet_sheet(1), 'C': outlet_sheet(2)})
+
+    assert not excel_sheets_to_json(str(excel_file), str(tmp_path / 'out.json'), per_sheet=True, workers=1)
+
+    assert "'A B'/'A_B'" in capsys.readouterr().out
+    assert not list(tmp_path.glob('out_*.json'))
+
+
+def test_batch_prints_each_workbook_log(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir('in')
+    for i in range(4):
+        outlet_sheet(i % 3).to_excel(f"in/book{i}.xlsx", index=False)
+
+    batch_excel_to_json('in', 'out', workers=2, schema='auto', quiet=True)
+
+    out = capsys.readouterr().out
+    assert 'Successfully converted: 4 files' in out
+    assert [line for line in out.splitlines() if 'Could not parse date' in line] == [
+        f"Warning: Could not parse date 'bad {i % 3}' in row {i % 3 + 2}, keeping original value" for i in range(4)]
+
+
+
+def test_batch_checkpoint_is_not_reused_for_other_output_options(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    os.mkdir('in')
+    outlet_sheet(0).to_excel('in/book.xlsx', index=False)
+    with open('in/broken.xlsx', 'wb') as f:
+        f.write(b'not a workbook')
+    # The broken workbook keeps the checkpoint of the plain run alive
+    batch_excel_to_json('in', 'out', workers=1, checkpoint=True, quiet=True)
+    assert os.listdir('out/.batch-checkpoint')
+
+    batch_excel_to_json('in', 'out', workers=1, checkpoint=True, compression='gz', quiet=True)
+
+    assert 'Already converted' not in capsys.readouterr().out.split('Conversion Summary')[-1]
+    assert os.path.exists('out/book_colored.json.gz')
+
+
+def write_filled_workbook(excel_file):
+    pd.DataFrame({'name': ['a', 'b', 'c'], 'warna': ['biru', None, None],
+                  'status': ['x', 'y', 'z']}).to_excel(excel_file, index=False)
+    workbook = load_workbook(excel_file)
+    worksheet = workbook.active
+    black = PatternFill(start_color='FF000000', end_color='FF000000', fill_type='solid')
+    red = PatternFill(start_color='FFFF0000', end_color='FFFF0000', fill_type='solid')
+    worksheet['A3'].fill = black
+    worksheet['C2'].fill = red
+    worksheet['C4'].fill = black
+    workbook.save(excel_file)
+
+
+@pytest.mark.parametrize('memory_limit', [None, 1])
+def test_color_columns_and_palette(tmp_path, memory_limit):
+    excel_file = tmp_path / 'in.xlsx'
+    json_file = tmp_path / 'out.json'
+    write_filled_workbook(excel_file)
+
+    assert excel_to_json(str(excel_file), str(json_file), memory_limit=memory_limit, quiet=True,
+                         color_columns=['1', 'status'], palette={'000000': 'hitam-custom'})
+
+    records = json.loads(json_file.read_text(encoding='utf-8'))
+    # Unfilled cells never match the black palette entry; column 1 falls back to 'warna'
+    assert [r['color'] for r in records] == ['biru', 'hitam-custom', None]
+    assert [r['color_status'] for r in records] == ['merah', None, 'hitam-custom']
+
+
+def test_cli_reads_color_columns_and_palette_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_filled_workbook('in.xlsx')
+    with open('palette.json', 'w', encoding='utf-8') as f:
+        json.dump({'#FF0000': 'merah-custom'}, f)
+    monkeypatch.setattr(sys, 'argv', ['exceltojson.py', 'in.xlsx', 'out.json', '--quiet',
+                                      '--color-columns', 'status', '--palette', 'palette.json'])
+
+    main()
+
+    records = json.loads((tmp_path / 'out.json').read_text(encoding='utf-8'))
+    assert [r['color_status'] for r in records] == ['merah-custom', None, 'hitam']
+    assert 'color' not in records[0]
@@ -0,0 +1,79 @@
+import json
+import pytest
+from otomasi_matching import hash_join, match_users, parse_key_spec
+from pipeline import run_pipeline
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    return str(path)
+
+
+@pytest.fixture
+def users(tmp_path):
+    left = write_json(tmp_path / 'old.json', [{'nama ': ' ali ', 'id': 1}, {'nama ': 'Budi', 'id': 2},
+                                              {'nama ': 'Cici', 'id': 3}])
+    right = write_json(tmp_path / 'hit.json', {'user': [{'name': 'ALI', 'src': 'a'}, {'name': 'Ali', 'src': 'b'},
+                                                        {'name': 'budi', 'src': 'c'}]})
+    return left, right
+
+
+def test_default_is_a_semi_join_like_the_original_script(tmp_path, users, capsys):
+    joined, unmatched = match_users(*users, output=str(tmp_path / 'm.json'),
+                                    unmatched_output=str(tmp_path / 'u.json'))
+    assert joined == [{'nama ': ' ali ', 'id': 1}, {'nama ': 'Budi', 'id': 2}]
+    assert unmatched == [{'nama ': 'Cici', 'id': 3}]
+    assert 'Baris yang cocok: 2, tidak cocok: 1' in capsys.readouterr().out
+
+
+def test_inner_join_emits_one_row_per_match(tmp_path, users):
+    joined, _ = match_users(*users, how='inner', output=str(tmp_path / 'm.json'), unmatched_output=None)
+    assert [(r['id'], r['match_src']) for r in joined] == [(1, 'a'), (1, 'b'), (2, 'c')]
+
+
+def test_anti_join_keeps_unmatched_rows(tmp_path, users):
+    joined, _ = match_users(*users, how='anti', output=str(tmp_path / 'm.json'), unmatched_output=None)
+    assert joined == [{'nama ': 'Cici', 'id': 3}]
+
+
+def test_streamed_jsonl_match_count(tmp_path, capsys):
+    left = tmp_path / 'old.jsonl'
+    left.write_text(''.join(json.dumps({'nama ': f"user {i}"}) + '\n' for i in range(2000)), encoding='utf-8')
+    right = write_json(tmp_path / 'hit.json', {'user': [{'name': f"USER {i}"} for i in range(0, 2000, 2)]})
+
+    joined, unmatched = match_users(str(left), right, output=str(tmp_path / 'm.json'), unmatched_output=None)
+
+    assert len(joined) == 1000 and len(unmatched) == 1000
+    assert 'Baris yang cocok: 1000, tidak cocok: 1000' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('build', ['left', 'right'])
+def test_hash_join_modes_agree_for_both_build_sides(build):
+    left = [{'k': 'a'}, {'k': 'b'}, {'k': None}]
+    right = [{'k': 'A', 'r': 1}, {'k': 'a', 'r': 2}]
+    keys = parse_key_spec('k')
+
+    def rows(how):
+        unmatched, stats = [], {}
+        joined = list(hash_join(left, right, keys, keys, how, build, 'm_', unmatched, stats))
+        assert unmatched == [{'k': 'b'}, {'k': None}] and stats['matched'] == 1
+        return joined
+
+    assert rows('semi') == [{'k': 'a'}]
+    assert rows('inner') == [{'k': 'a', 'm_k': 'A', 'm_r': 1}, {'k': 'a', 'm_k': 'a', 'm_r': 2}]
+    assert rows('left') == rows('inner') + [{'k': 'b'}, {'k': None}]
+    assert rows('anti') == [{'k': 'b'}, {'k': None}]
+
+
+def test_hash_join_rejects_unknown_modes():
+    with pytest.raises(ValueError, match='Unknown join mode'):
+        list(hash_join([], [], [], [], 'outer'))
+
+
+@pytest.mark.parametrize('how', ['semi', 'inner', 'left', 'anti'])
+def test_pipeline_and_match_users_join_the_same_way(tmp_path, users, how):
+    left, right = users
+    joined, _ = match_users(left, right, how=how, output=str(tmp_path / 'm.json'), unmatched_output=None)
+    assert run_pipeline(left, str(tmp_path / 'p.json'), clean=False, match_file=right, left_keys='nama ',
+                        right_keys='name', how=how, match_container='user')
+    assert json.loads((tmp_path / 'p.json').read_text(encoding='utf-8')) == joined
@@ -0,0 +1,43 @@
+import pytest
+from perf_guard import BENCHMARKS, prepare_datasets, measure, compare, load_baselines, save_results
+
+
+@pytest.fixture(scope='session')
+def perf_options(request):
+    option = request.config.option
+    return {
+        'rows': option.perf_rows,
+        'repeat': option.perf_repeat,
+        'tolerance': option.perf_tolerance,
+        'baseline': option.perf_baseline,
+        'update': option.perf_update,
+    }
+
+
+@pytest.fixture(scope='session')
+def perf_datasets(tmp_path_factory, perf_options):
+    """Fixed seeded input files, generated once per session"""
+    workdir = tmp_path_factory.mktemp('perf')
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(workdir)
+        prepare_datasets(perf_options['rows'])
+    return workdir
+
+
+@pytest.mark.perf
+@pytest.mark.parametrize('name', list(BENCHMARKS))
+def test_throughput_and_memory_budget(name, perf_datasets, perf_options, monkeypatch):
+    monkeypatch.chdir(perf_datasets)
+    rows = perf_options['rows']
+    result = measure(BENCHMARKS[name], rows, perf_options['repeat'])
+
+    if perf_options['update']:
+        save_results(perf_options['baseline'], rows, {name: result})
+        return
+    baseline = load_baselines(perf_options['baseline']).get(str(rows), {}).get(name)
+    if baseline is None:
+        pytest.skip(f"no baseline for {name} at {rows} rows in {perf_options['baseline']}; "
+                    f"run pytest -m perf --perf-update")
+
+    failures = compare(name, result, baseline, perf_options['tolerance'])
+    assert not failures, '\n'.join(failures)
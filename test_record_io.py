@@ -0,0 +1,36 @@
+import json
+import pandas as pd
+import pytest
+from jsontoexcel import convert_json_to_excel
+from record_io import compression_of, open_text, strip_compression
+
+RECORDS = [{'name': 'Toko é', 'n': 1}, {'name': 'Ali', 'n': None}]
+
+
+@pytest.mark.parametrize('suffix', ['', '.gz', '.bz2', '.xz', '.zst'])
+def test_open_text_round_trip(tmp_path, suffix):
+    if suffix == '.zst':
+        pytest.importorskip('zstandard')
+    path = tmp_path / f"data.json{suffix}"
+    with open_text(path, 'w') as f:
+        json.dump(RECORDS, f, ensure_ascii=False)
+    with open_text(path) as f:
+        assert json.load(f) == RECORDS
+    if suffix:
+        assert path.read_bytes()[:1] != b'['
+
+
+def test_compression_suffixes():
+    assert compression_of('a.JSON.GZ') == '.gz'
+    assert compression_of('a.json') is None
+    assert strip_compression('a.json.zst') == 'a.json'
+
+
+def test_jsontoexcel_reads_a_compressed_export(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open_text('export.json.gz', 'w') as f:
+        json.dump({'outlets': RECORDS}, f, ensure_ascii=False)
+
+    convert_json_to_excel(json_file='export.json.gz')
+
+    assert pd.read_excel('excel-baru.xlsx').to_dict('records')[0] == {'name': 'Toko é', 'n': 1}
@@ -0,0 +1,32 @@
+import pytest
+from schema_profiles import SchemaDriftError, resolve_json_schema, resolve_schema
+
+RECORDS = [{'name': 'Ali', 'birth_date': '19/4/1997', 'n': 1},
+           {'name': 'Budi', 'birth_date': '9/10/1997', 'n': 2}]
+
+
+def test_profile_keeps_only_what_converters_use(tmp_path):
+    profile, cached = resolve_schema(['name', 'birth_date', 'n'], RECORDS, 'outlets', cache_dir=tmp_path)
+    assert not cached
+    assert set(profile) == {'name', 'fingerprint', 'container_key', 'columns', 'date_formats', 'styling', 'created'}
+    assert profile['date_formats'] == {'birth_date': '%d/%m/%Y'}
+    assert resolve_schema(['name', 'birth_date', 'n'], RECORDS, 'outlets', cache_dir=tmp_path) == (profile, True)
+
+
+def test_named_template_fails_on_a_changed_header(tmp_path):
+    resolve_schema(['name', 'birth_date', 'n'], RECORDS, 'outlets', cache_dir=tmp_path)
+    with pytest.raises(SchemaDriftError, match='missing columns: n; new columns: phone'):
+        resolve_schema(['name', 'birth_date', 'phone'], RECORDS, 'outlets', cache_dir=tmp_path)
+
+
+def test_auto_profiles_each_header_separately(tmp_path):
+    first, _ = resolve_schema(['name', 'birth_date', 'n'], RECORDS, 'auto', cache_dir=tmp_path)
+    second, cached = resolve_schema(['name', 'phone'], RECORDS, 'auto', cache_dir=tmp_path)
+    assert not cached and second['fingerprint'] != first['fingerprint']
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_known_template_reads_its_container_key(tmp_path):
+    resolve_json_schema({'outlets': RECORDS}, 'outlets', 'plain', cache_dir=tmp_path)
+    records, profile, cached = resolve_json_schema({'meta': [], 'outlets': RECORDS}, 'outlets', cache_dir=tmp_path)
+    assert cached and records == RECORDS and profile['styling'] == 'plain'
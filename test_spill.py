@@ -0,0 +1,49 @@
+import json
+from datetime import datetime
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+from spill import RecordSpool, parse_memory_limit, scan_columns, write_excel_streaming, write_json_streaming
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, None), (1024, 1024), ('512', 512), ('512M', 512 * 1024 ** 2),
+    ('2G', 2 * 1024 ** 3), ('1.5g', int(1.5 * 1024 ** 3)), (' 64 KiB ', 64 * 1024),
+])
+def test_parse_memory_limit(value, expected):
+    assert parse_memory_limit(value) == expected
+
+
+def test_parse_memory_limit_rejects_garbage():
+    with pytest.raises(ValueError, match='Invalid memory limit'):
+        parse_memory_limit('lots')
+
+
+def test_spool_keeps_insertion_order_across_chunks():
+    records = [{'n': i, 'name': 'x' * (i % 5)} for i in range(25)]
+    with RecordSpool(chunk_rows=4) as spool:
+        spool.extend(records)
+        assert len(spool) == 25
+        assert spool[3] == records[3]
+        assert list(spool) == records
+        assert spool.columns == {'n': 2, 'name': 4}
+        with pytest.raises(IndexError):
+            spool[25]
+
+
+@pytest.mark.parametrize('records', [[], [{'a': 1}], [{'a': 'é', 'b': [1, {'c': None}]}, {'d': 2.5}]])
+def test_json_streaming_matches_json_dump(tmp_path, records):
+    path = tmp_path / 'out.json'
+    write_json_streaming(iter(records), str(path))
+    assert path.read_text(encoding='utf-8') == json.dumps(records, indent=2, ensure_ascii=False)
+
+
+def test_excel_streaming_writes_every_row(tmp_path):
+    records = [{'name': 'Ali', 'when': datetime(2024, 1, 2, 3, 4, 5)}, {'name': 'Budi', 'extra': 7}]
+    path = tmp_path / 'out.xlsx'
+    write_excel_streaming(records, str(path), 'Data', 'plain')
+
+    assert scan_columns(records) == {'name': 4, 'when': 19, 'extra': 1}
+    pd.testing.assert_frame_equal(pd.read_excel(path), pd.DataFrame(records))
+    worksheet = load_workbook(path)['Data']
+    assert worksheet['B2'].number_format == 'YYYY-MM-DD HH:MM:SS'